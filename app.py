@@ -186,11 +186,8 @@ def create_app():
             # Fetch PR data
             try:
                 logger.info("Fetching PR data from GitHub")
-                pr_data = github_service.fetch_pr_data(pr_details)
-                
-                # Fetch files and comments using sync methods
-                files = github_service.fetch_pr_files_sync(pr_details)
-                comments = github_service.fetch_pr_comments_sync(pr_details)
+                # PR data, files and comments are fetched concurrently
+                context = github_service.fetch_pr_context(pr_details)
             except ValueError as e:
                 flash(f'Error accessing PR: {str(e)}', 'error')
                 return redirect(url_for('index'))
@@ -198,12 +195,6 @@ def create_app():
             # Analyze with Claude
             logger.info("Analyzing PR with Claude")
             try:
-                context = {
-                    'pr_data': pr_data,
-                    'files': files,
-                    'comments': comments
-                }
-                
                 review_data = claude_service.analyze_pr_sync(context)
             except ValueError as e:
                 flash(f'Error analyzing PR: {str(e)}', 'error')
@@ -3,6 +3,8 @@ from typing import Dict, Any, Optional, List
 import ast
 import re
 import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
 
 # Configure logging
@@ -19,10 +21,24 @@ class DocumentationError(Exception):
 class DocumentationParser:
     """Parser for code documentation with multi-language support"""
     
+    # Parsed files kept per instance; the parser is shared across reviews
+    CACHE_SIZE = 128
+    
+    # Patterns are compiled once at import and shared by every parser instance
+    JSDOC_BLOCK_PATTERN = re.compile(r'/\*\*\s*(.*?)\s*\*/', re.DOTALL)
+    
+    # Captures the tag with its '@' so matches can be filed without rebuilding the name
+    JSDOC_TAG_PATTERN = re.compile(r'(@\w+)\s+([^\n@]*)')
+    
+    # Declarations counted towards JSDoc coverage, checked per word
+    JS_ELEMENT_KEYWORDS = frozenset({'function', 'class', 'interface', 'type', 'const', 'let', 'var'})
+    WORD_PATTERN = re.compile(r'\w+')
+    
     def __init__(self):
         """Initialize the documentation parser plugin."""
         self.initialized = False
-        self._cache = {}
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
         self.supported_languages = {
             '.py': self._parse_python_docs,
             '.js': self._parse_jsdoc,
@@ -85,8 +101,12 @@ class DocumentationParser:
                     
                 # Check cache
                 cache_key = f"{filename}:{hash(content)}"
-                if cache_key in self._cache:
-                    results[filename] = self._cache[cache_key]
+                with self._cache_lock:
+                    cached = self._cache.get(cache_key)
+                    if cached is not None:
+                        self._cache.move_to_end(cache_key)
+                if cached is not None:
+                    results[filename] = cached
                     continue
                     
                 # Parse documentation
@@ -97,7 +117,10 @@ class DocumentationParser:
                     try:
                         doc_info = parser(content)
                         results[filename] = doc_info
-                        self._cache[cache_key] = doc_info
+                        with self._cache_lock:
+                            self._cache[cache_key] = doc_info
+                            if len(self._cache) > self.CACHE_SIZE:
+                                self._cache.popitem(last=False)
                     except Exception as e:
                         logger.error(f"Failed to parse documentation in {filename}: {str(e)}")
                         results[filename] = {'error': str(e)}
@@ -123,7 +146,8 @@ class DocumentationParser:
             
     def cleanup(self) -> None:
         """Clean up parser resources."""
-        self._cache.clear()
+        with self._cache_lock:
+            self._cache.clear()
         
     def _parse_python_docs(self, content: str) -> Dict[str, Any]:
         """Parse Python documentation strings."""
@@ -172,13 +196,16 @@ class DocumentationParser:
             'quality_score': 0
         }
         
+        # Files without a single JSDoc opener have nothing to parse and score zero
+        if '/**' not in content:
+            return docs
+        
         try:
             # Match JSDoc blocks
-            jsdoc_pattern = r'/\*\*\s*(.*?)\s*\*/'
-            matches = re.finditer(jsdoc_pattern, content, re.DOTALL)
+            matches = self.JSDOC_BLOCK_PATTERN.finditer(content)
             
             # Count total elements to calculate coverage
-            total_elements = len(re.findall(r'\bfunction\b|\bclass\b|\binterface\b|\btype\b|\bconst\b|\blet\b|\bvar\b', content))
+            total_elements = sum(map(self.JS_ELEMENT_KEYWORDS.__contains__, self.WORD_PATTERN.findall(content)))
             documented_elements = 0
             
             for match in matches:
@@ -232,14 +259,10 @@ class DocumentationParser:
     def _parse_jsdoc_tags(self, content: str) -> Dict[str, List[str]]:
         """Parse JSDoc tags into a structured format."""
         tags = {}
-        tag_pattern = r'@(\w+)\s+([^\n@]*)'
-        
-        for match in re.finditer(tag_pattern, content):
-            tag, value = match.groups()
-            tag_name = f'@{tag}'
-            if tag_name not in tags:
-                tags[tag_name] = []
-            tags[tag_name].append(value.strip())
+        if '@' not in content:
+            return tags
+        for tag_name, value in self.JSDOC_TAG_PATTERN.findall(content):
+            tags.setdefault(tag_name, []).append(value.strip())
             
         return tags
         
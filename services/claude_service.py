@@ -1,10 +1,25 @@
 import anthropic
-from typing import Dict, List, Union, Any, Optional
+import httpx
+import importlib.util
+import io
+from typing import Dict, Iterable, List, Tuple, Union, Any, Optional
 import logging
 import json
+import functools
+import os
 import re
+import string
+import itertools
+import threading
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -13,181 +28,141 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 from services.dependency_service import DependencyService
-from services.code_structure_service import CodeStructureService
+from services.code_structure_service import CodeStructureService, ComplexityMetrics
 from services.language_detection_service import LanguageDetectionService
 from plugins.documentation_parser import DocumentationParser
 
-class ClaudeService:
-    def __init__(self, api_key: str):
-        """Initialize Claude service with proper error handling"""
-        self.use_mock = True
-        self.init_error = None
-        self.client = None
-        self.dependency_service = None
-        self.code_structure_service = None
-        self.language_detection_service = None
-        self.doc_parser = None
-
-        if not api_key:
-            logger.warning("No Claude API key provided, falling back to mock service")
-            self.init_error = "No API key provided"
-            return
-            
-        try:
-            # Initialize Claude client
-            self.client = anthropic.Anthropic(
-                api_key=api_key,
-                default_headers={
-                    "HTTP-Referer": "https://github.com",
-                    "X-API-Lang": "python",
-                    "X-Client-Version": "1.0.0"
-                }
-            )
-            
-            # Initialize services
-            self.dependency_service = DependencyService()
-            self.code_structure_service = CodeStructureService()
-            self.language_detection_service = LanguageDetectionService()
-            
-            # Initialize documentation parser
-            self.doc_parser = DocumentationParser()
-            self.doc_parser.initialize()
-            
-            self.use_mock = False
-            logger.info("Claude API client and services initialized successfully")
-        except Exception as e:
-            logger.error(f"Failed to initialize services: {str(e)}")
-            self.use_mock = True
-            self.init_error = str(e)
-    
-    def analyze_pr_sync(self, context: Dict) -> Dict:
-        """Synchronous version of analyze_pr that handles documentation parsing"""
-        if self.use_mock:
-            logger.info("Using mock review service")
-            mock_reason = getattr(self, 'init_error', 'APIUnavailable')
-            return self.mock_review(context, mock_reason)
-            
-        try:
-            # Add dependency, code structure, and documentation analysis
-            if 'files' in context:
-                # Parse documentation
-                logger.info("Running documentation analysis")
-                try:
-                    doc_analysis = self.doc_parser.execute_sync({
-                        'files': [{'filename': f['filename'], 'content': f.get('content', '')} for f in context['files']]
-                    })
-                    context['documentation_analysis'] = doc_analysis
-                    logger.info("Documentation analysis completed successfully")
-                except Exception as e:
-                    logger.error(f"Documentation analysis failed: {str(e)}")
-                    context['documentation_analysis'] = None
-
-                # Perform language detection
-                logger.info("Running language detection")
-                try:
-                    language_detection = self.language_detection_service.detect_from_files(context['files'])
-                    context['language_detection'] = language_detection
-                    logger.info(f"Language Determination: Primary language detected: {language_detection['primary']['name']}")
-                except Exception as e:
-                    logger.error(f"Language Determination: Failed to detect languages: {str(e)}")
-                    context['language_detection'] = None
-                
-                logger.info("Running dependency analysis")
-                if self.dependency_service:
-                    dependency_analysis = self.dependency_service.analyze_dependencies(context['files'])
-                    context['dependency_analysis'] = dependency_analysis
-                
-                logger.info("Running code structure analysis")
-                structure_analysis = {}
-                if self.code_structure_service:
-                    for file in context['files']:
-                        try:
-                            analysis = self.code_structure_service.analyze_code(
-                                file.get('content', ''),
-                                file['filename']
-                            )
-                            if isinstance(analysis, dict):
-                                structure_analysis[file['filename']] = analysis
-                            else:
-                                structure_analysis[file['filename']] = {
-                                    'structures': getattr(analysis, 'structures', []),
-                                    'imports': getattr(analysis, 'imports', []),
-                                    'total_complexity': getattr(analysis, 'total_complexity', {})
-                                }
-                        except Exception as e:
-                            logger.error(f"Error analyzing {file['filename']}: {str(e)}")
-                context['structure_analysis'] = structure_analysis
-            
-            logger.info("Building analysis prompt")
-            prompt = self._build_analysis_prompt(context)
-            
-            logger.info("Sending request to Claude API")
-            if not self.client:
-                raise ValueError("Claude API client not initialized")
-                
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4096,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                system="You are a code review expert. Analyze pull requests thoroughly and provide constructive feedback focusing on code quality, security, and best practices."
-            )
-            
-            logger.info("Successfully received response from Claude API")
-            return self._parse_claude_response(response)
-            
-        except anthropic.APIError as e:
-            logger.error(f"Claude API error: {str(e)}")
-            error_msg = f"API Error: {str(e)}"
-            return self.mock_review(context, error_msg)
-        except Exception as e:
-            logger.error(f"Unexpected error during PR analysis: {str(e)}")
-            error_msg = f"Unexpected error: {str(e)}"
-            return self.mock_review(context, error_msg)
-    
-    def mock_review(self, context: Dict, mock_reason: str = "APIUnavailable") -> Dict:
-        """Generate a detailed mock review response with error context"""
-        logger.info(f"Generating mock review. Reason: {mock_reason}")
-        
-        files_count = context['pr_data']['changed_files']
-        additions = context['pr_data']['additions']
-        deletions = context['pr_data']['deletions']
-        
-        # Get code structure analysis metrics if available
-        structure_analysis = context.get('structure_analysis', {})
-        has_metrics = bool(structure_analysis)
-        
-        # Get language information from detection results
-        language_detection = context.get('language_detection', {})
-        primary_language = "Unknown"
-        secondary_languages = []
-        file_extensions = set()
-        
-        if language_detection and 'primary' in language_detection:
-            primary_language = language_detection['primary']['name']
-            secondary_languages = [lang['name'] for lang in language_detection.get('secondary', [])]
-        elif 'files' in context:
-            # Fallback to extension-based detection
-            for file in context['files']:
-                ext = file['filename'].split('.')[-1] if '.' in file['filename'] else ''
-                if ext:
-                    file_extensions.add(ext)
-            if file_extensions:
-                primary_language = max(file_extensions, key=list(file_extensions).count)
-
-        mock_response = f"""<div class="review-section">
+def build_structure_metrics(totals: Iterable[Tuple[str, ComplexityMetrics]]) -> Dict[str, List]:
+    """Lay out per-file complexity totals column-wise, one list per metric.
+
+    Args:
+        totals: (filename, ComplexityMetrics) pairs
+
+    Returns:
+        Dict with parallel 'filenames', 'cyclomatic', 'cognitive',
+        'nesting' and 'maintainability' lists
+    """
+    columns = {
+        'filenames': [],
+        'cyclomatic': [],
+        'cognitive': [],
+        'nesting': [],
+        'maintainability': []
+    }
+    for filename, total in totals:
+        columns['filenames'].append(filename)
+        columns['cyclomatic'].append(total.cyclomatic_complexity)
+        columns['cognitive'].append(total.cognitive_complexity)
+        columns['nesting'].append(total.nesting_depth)
+        columns['maintainability'].append(total.maintainability_index)
+    return columns
+
+@functools.lru_cache(maxsize=1)
+def shared_doc_parser() -> DocumentationParser:
+    """Process-wide documentation parser, initialized on first use"""
+    parser = DocumentationParser()
+    parser.initialize()
+    return parser
+
+@functools.lru_cache(maxsize=1)
+def shared_code_structure_service() -> CodeStructureService:
+    """Process-wide code structure service, so analyzer probing runs once"""
+    return CodeStructureService()
+
+def _build_http_client() -> httpx.Client:
+    """Create a pooled keep-alive HTTP client for the Anthropic API.
+
+    HTTP/2 is only enabled when the optional ``h2`` package is installed.
+    """
+    transport = httpx.HTTPTransport(
+        http2=importlib.util.find_spec('h2') is not None,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100),
+        retries=2
+    )
+    return anthropic.DefaultHttpxClient(transport=transport)
+
+# Formatted file lists keyed by (filename, status, additions, deletions, hash(patch))
+# per file, so repeated PR inputs skip formatting without pinning whole patch sets
+_FILE_ENTRIES_CACHE_SIZE = 128
+_file_entries_cache: "OrderedDict[Tuple, str]" = OrderedDict()
+_file_entries_lock = threading.Lock()
+
+def _format_file_entries(entries: List[Tuple[str, str, int, int, str]]) -> str:
+    """Format (filename, status, additions, deletions, patch) entries for the prompt"""
+    parts = ["Modified Files:\n"]
+    for filename, status, additions, deletions, patch in entries:
+        parts.append(f"\n{filename}:\n- Status: {status}\n- Changes: +{additions}, -{deletions}\n")
+        if patch:
+            if len(patch) > MAX_PATCH_CHARS:
+                # Keep the head and tail of oversized diffs to bound prompt tokens
+                omitted = len(patch) - 2 * PATCH_EDGE_CHARS
+                patch = (
+                    patch[:PATCH_EDGE_CHARS]
+                    + f"\n...[{omitted} chars omitted]...\n"
+                    + patch[-PATCH_EDGE_CHARS:]
+                )
+            parts.append(f"- Diff:\n```\n{patch}\n```\n")
+    return "".join(parts)
+
+def _dumps_json(data: Any, indent: bool = False) -> str:
+    """Serialize prompt data to JSON, preferring orjson when it is installed"""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(data, default=str, option=option).decode()
+    return json.dumps(data, default=str, indent=2 if indent else None)
+
+SOURCE_EXTENSIONS = frozenset({
+    '.py', '.js', '.ts', '.tsx', '.jsx', '.go', '.rs', '.java',
+    '.c', '.cpp', '.h', '.rb', '.php', '.cs'
+})
+
+# Diffs longer than this are cut down to their first and last PATCH_EDGE_CHARS
+MAX_PATCH_CHARS = 4000
+PATCH_EDGE_CHARS = 2000
+
+# Shared read-only default for files whose analysis has no complexity totals
+_EMPTY_METRICS = ComplexityMetrics()
+
+_PROMPT_HEADER = "\n".join([
+    "Please provide a thorough code review for this pull request. Focus on:",
+    "- Code Quality and Best Practices",
+    "- Dependencies and Architecture",
+    "- Potential Issues",
+    "- Security Considerations",
+    "- Performance Implications",
+    "- Suggested Improvements",
+])
+
+_STATIC_INSTRUCTIONS = "\n".join([
+    "Structure your response using HTML with Bootstrap classes:",
+    "1. Use .review-section for main sections",
+    "2. Wrap content in .card and .card-body",
+    '3. Use <ul class="list-unstyled mb-0"> for lists',
+    "4. Place icons before text content in list items:",
+    '   <li><i class="bi bi-[icon-name] [text-color]"></i> Content</li>',
+    "5. Use these icons consistently:",
+    "   - bi-check-circle text-success (for good practices)",
+    "   - bi-exclamation-triangle text-warning (for warnings)",
+    "   - bi-exclamation-circle (for issues)",
+    "   - bi-shield-exclamation (for security warnings)",
+    "   - bi-speedometer2 (for performance metrics)",
+])
+
+# Preamble and markdown code fences Claude sometimes wraps around the review HTML
+_RESPONSE_PREAMBLE_RE = re.compile(r"^Here's the code review feedback.*?:\s*", re.IGNORECASE)
+_CODE_FENCE_RE = re.compile(r'```html\s*|\s*```$', re.IGNORECASE)
+
+# Static mock review markup; only the per-PR values are substituted per call
+_MOCK_TEMPLATE = string.Template("""<div class="review-section">
     <h3>Summary of Changes</h3>
     <div class="card mb-3">
         <div class="card-body">
             <ul class="list-unstyled mb-0">
-                <li><i class="bi bi-file-earmark-text"></i> Files Modified: {files_count}</li>
-                <li><i class="bi bi-plus-circle"></i> Lines Added: {additions}</li>
-                <li><i class="bi bi-dash-circle"></i> Lines Removed: {deletions}</li>
-                <li><i class="bi bi-code-square"></i> Primary Language: {primary_language}</li>
-                {'<li><i class="bi bi-collection"></i> Other Languages: ' + ', '.join(secondary_languages) + '</li>' if secondary_languages else ''}
+                <li><i class="bi bi-file-earmark-text"></i> Files Modified: $files_count</li>
+                <li><i class="bi bi-plus-circle"></i> Lines Added: $additions</li>
+                <li><i class="bi bi-dash-circle"></i> Lines Removed: $deletions</li>
+                <li><i class="bi bi-code-square"></i> Primary Language: $primary_language</li>
+                $other_languages
             </ul>
         </div>
     </div>
@@ -255,32 +230,7 @@ class ClaudeService:
     <div class="card mb-3">
         <div class="card-body">
             <h4>Complexity Metrics</h4>
-            <ul class="list-unstyled mb-0">"""
-        
-        if has_metrics:
-            for filename, analysis in structure_analysis.items():
-                total = analysis.get('total_complexity', ComplexityMetrics())
-                total_dict = {
-                    'cyclomatic_complexity': total.cyclomatic_complexity,
-                    'cognitive_complexity': total.cognitive_complexity,
-                    'nesting_depth': total.nesting_depth,
-                    'maintainability_index': total.maintainability_index
-                }
-                mock_response += f"""
-                <li class="mb-3">
-                    <strong>{filename}</strong>
-                    <ul class="list-unstyled ps-3">
-                        <li><i class="bi bi-graph-up"></i> Cyclomatic Complexity: {total_dict['cyclomatic_complexity']}</li>
-                        <li><i class="bi bi-brain"></i> Cognitive Complexity: {total_dict['cognitive_complexity']}</li>
-                        <li><i class="bi bi-diagram-2"></i> Nesting Depth: {total_dict['nesting_depth']}</li>
-                        <li><i class="bi bi-speedometer2"></i> Maintainability Index: {total_dict['maintainability_index']:.1f}</li>
-                    </ul>
-                </li>"""
-        else:
-            mock_response += """
-                <li><i class="bi bi-exclamation-circle text-warning"></i> Code structure analysis not available</li>"""
-            
-        mock_response += """
+            <ul class="list-unstyled mb-0">$file_rows
             </ul>
         </div>
     </div>
@@ -316,8 +266,129 @@ class ClaudeService:
 
 <div class="alert alert-warning mt-3">
     <i class="bi bi-info-circle me-2"></i> Note: This is a mock review generated for testing purposes. 
-    <br>Reason: {mock_reason}
-</div>"""
+    <br>Reason: $mock_reason
+</div>""")
+
+_MOCK_FILE_ROW = string.Template("""
+                <li class="mb-3">
+                    <strong>$filename</strong>
+                    <ul class="list-unstyled ps-3">
+                        <li><i class="bi bi-graph-up"></i> Cyclomatic Complexity: $cyclomatic_complexity</li>
+                        <li><i class="bi bi-brain"></i> Cognitive Complexity: $cognitive_complexity</li>
+                        <li><i class="bi bi-diagram-2"></i> Nesting Depth: $nesting_depth</li>
+                        <li><i class="bi bi-speedometer2"></i> Maintainability Index: $maintainability_index</li>
+                    </ul>
+                </li>""")
+
+_MOCK_NO_METRICS_ROW = """
+                <li><i class="bi bi-exclamation-circle text-warning"></i> Code structure analysis not available</li>"""
+
+
+class ClaudeService:
+    def __init__(self, api_key: str):
+        """Initialize Claude service with proper error handling"""
+        self.use_mock = True
+        self.init_error = None
+        self.client = None
+        self.dependency_service = None
+        self.code_structure_service = None
+        self.language_detection_service = None
+        self.doc_parser = None
+
+        if not api_key:
+            logger.warning("No Claude API key provided, falling back to mock service")
+            self.init_error = "No API key provided"
+            return
+            
+        try:
+            # Initialize Claude client
+            self.client = anthropic.Anthropic(
+                api_key=api_key,
+                http_client=_build_http_client(),
+                default_headers={
+                    "HTTP-Referer": "https://github.com",
+                    "X-API-Lang": "python",
+                    "X-Client-Version": "1.0.0"
+                }
+            )
+            
+            # Initialize services
+            self.dependency_service = DependencyService()
+            self.code_structure_service = shared_code_structure_service()
+            self.language_detection_service = LanguageDetectionService()
+            
+            # Initialize documentation parser
+            self.doc_parser = shared_doc_parser()
+            
+            self.use_mock = False
+            logger.info("Claude API client and services initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize services: {str(e)}")
+            self.use_mock = True
+            self.init_error = str(e)
+    
+    def mock_review(self, context: Dict, mock_reason: str = "APIUnavailable") -> Dict:
+        """Generate a detailed mock review response with error context"""
+        logger.info(f"Generating mock review. Reason: {mock_reason}")
+        
+        files_count = context['pr_data']['changed_files']
+        additions = context['pr_data']['additions']
+        deletions = context['pr_data']['deletions']
+        
+        # Get code structure analysis metrics if available
+        structure_analysis = context.get('structure_analysis') or {}
+        has_metrics = bool(structure_analysis.get('filenames'))
+        
+        # Get language information from detection results
+        language_detection = context.get('language_detection', {})
+        primary_language = "Unknown"
+        secondary_languages = []
+        
+        if language_detection and 'primary' in language_detection:
+            primary_language = language_detection['primary']['name']
+            secondary_languages = [lang['name'] for lang in language_detection.get('secondary', [])]
+        elif 'files' in context:
+            # Fallback to extension-based detection
+            extension_counts = Counter(
+                os.path.splitext(file['filename'])[1][1:]
+                for file in context['files']
+            )
+            extension_counts.pop('', None)
+            if extension_counts:
+                primary_language = extension_counts.most_common(1)[0][0]
+
+        if has_metrics:
+            file_rows = "".join([
+                _MOCK_FILE_ROW.substitute(
+                    filename=filename,
+                    cyclomatic_complexity=cyclomatic,
+                    cognitive_complexity=cognitive,
+                    nesting_depth=nesting,
+                    maintainability_index=format(maintainability, '.1f')
+                )
+                for filename, cyclomatic, cognitive, nesting, maintainability in zip(
+                    structure_analysis['filenames'],
+                    structure_analysis['cyclomatic'],
+                    structure_analysis['cognitive'],
+                    structure_analysis['nesting'],
+                    structure_analysis['maintainability']
+                )
+            ])
+        else:
+            file_rows = _MOCK_NO_METRICS_ROW
+
+        mock_response = _MOCK_TEMPLATE.substitute(
+            files_count=files_count,
+            additions=additions,
+            deletions=deletions,
+            primary_language=primary_language,
+            other_languages=(
+                '<li><i class="bi bi-collection"></i> Other Languages: '
+                + ', '.join(secondary_languages) + '</li>'
+            ) if secondary_languages else '',
+            file_rows=file_rows,
+            mock_reason=mock_reason
+        )
 
         return {
             'summary': mock_response,
@@ -326,183 +397,135 @@ class ClaudeService:
             'mock_reason': mock_reason
         }
     
-    def _build_analysis_prompt(self, context: Dict) -> str:
-        """Builds a comprehensive analysis prompt for Claude"""
-        pr_data = context['pr_data']
-        files = context.get('files', [])
-        comments = context.get('comments', [])
-        dependency_analysis = context.get('dependency_analysis', {})
-        documentation_analysis = context.get('documentation_analysis', {})
-
-        prompt = f"""PR Details:
-Title: {pr_data['title']}
-Description: {pr_data['body'] or 'No description provided'}
-
-Changes Overview:
-- Files changed: {pr_data['changed_files']}
-- Additions: {pr_data['additions']}
-- Deletions: {pr_data['deletions']}
-
-Modified Files:
-{self._format_files(files)}
-
-Discussion Context:
-{self._format_comments(comments)}
-
-Dependency Analysis:
-Documentation Analysis:
-{self._format_documentation_analysis(documentation_analysis)}
-
-{self._format_dependency_analysis(dependency_analysis)}
-
-Structure your response using HTML with Bootstrap classes:
-1. Use .review-section for main sections
-2. Wrap content in .card and .card-body
-3. Use <ul class="list-unstyled mb-0"> for lists
-4. Place icons before text content in list items:
-   <li><i class="bi bi-[icon-name] [text-color]"></i> Content</li>
-5. Use these icons consistently:
-   - bi-check-circle text-success (for good practices)
-   - bi-exclamation-triangle text-warning (for warnings)
-   - bi-exclamation-circle (for issues)
-   - bi-shield-exclamation (for security warnings)
-   - bi-speedometer2 (for performance metrics)
-6. Organize content into sections:
-   - Code Quality and Best Practices
-   - Dependencies and Architecture
-   - Potential Issues
-    - Security Considerations
-   - Performance Implications
-   - Suggested Improvements"""
-
     def _build_analysis_prompt(self, context: Dict) -> str:
         """Build analysis prompt with PR context"""
-        prompt = """Please provide a thorough code review for this pull request. Focus on:
-- Code Quality and Best Practices
-- Dependencies and Architecture
-- Potential Issues
-- Security Considerations
-- Performance Implications
-- Suggested Improvements"""
+        buf = io.StringIO()
+        buf.write(_PROMPT_HEADER)
 
         # Add PR data section
         if 'pr_data' in context:
-            prompt += "\n\nPR Details:\n" + str(context['pr_data'])
+            buf.write("\n\nPR Details:\n")
+            buf.write(_dumps_json(context['pr_data']))
 
         # Add files section
         if 'files' in context:
-            prompt += "\n\n" + self._format_files(context['files'])
+            buf.write("\n\n")
+            self._format_files(buf, context['files'])
 
         # Add comments section
         if 'comments' in context:
-            prompt += "\n\n" + self._format_comments(context['comments'])
+            buf.write("\n\n")
+            self._format_comments(buf, context['comments'])
 
         # Add language detection results
         if context.get('language_detection'):
-            prompt += "\n\nLanguage Detection:\n"
-            prompt += f"Primary: {context['language_detection']['primary']['name']}\n"
+            buf.write("\n\nLanguage Detection:\n")
+            buf.write(f"Primary: {context['language_detection']['primary']['name']}\n")
             if context['language_detection'].get('secondary'):
-                prompt += "Secondary Languages:\n"
+                buf.write("Secondary Languages:\n")
                 for lang in context['language_detection']['secondary']:
-                    prompt += f"- {lang['name']} ({lang['percentage']}%)\n"
+                    buf.write(f"- {lang['name']} ({lang['percentage']}%)\n")
 
         # Add dependency analysis
         if context.get('dependency_analysis'):
-            prompt += "\n\n" + self._format_dependency_analysis(context['dependency_analysis'])
+            buf.write("\n\n")
+            self._format_dependency_analysis(buf, context['dependency_analysis'])
 
         # Add documentation analysis
         if context.get('documentation_analysis'):
-            prompt += "\n\n" + self._format_documentation_analysis(context['documentation_analysis'])
+            buf.write("\n\n")
+            self._format_documentation_analysis(buf, context['documentation_analysis'])
+
+        # Add HTML formatting instructions
+        buf.write("\n\n")
+        buf.write(_STATIC_INSTRUCTIONS)
 
-        return prompt
-    def _format_files(self, files: List[Dict]) -> str:
-        """Format files list for prompt"""
+        return buf.getvalue()
+
+    def _format_files(self, buf: io.StringIO, files: List[Dict]) -> None:
+        """Write the files list for the prompt into buf"""
         if not files:
-            return "No files were modified"
+            buf.write("No files were modified")
+            return
             
-        formatted = "Modified Files:\n"
-        for file in files:
-            formatted += f"\n{file['filename']}:\n"
-            formatted += f"- Status: {file['status']}\n"
-            formatted += f"- Changes: +{file['additions']}, -{file['deletions']}\n"
-            if file.get('patch'):
-                formatted += f"- Diff:\n```\n{file['patch']}\n```\n"
-        return formatted
-
-    def _format_comments(self, comments: List[Dict]) -> str:
-        """Format PR comments for prompt"""
+        entries = [
+            (file['filename'], file['status'], file['additions'], file['deletions'], file.get('patch') or '')
+            for file in files
+        ]
+        
+        # Retried PRs and webhook replays usually carry identical file sets
+        key = tuple(
+            (filename, status, additions, deletions, hash(patch))
+            for filename, status, additions, deletions, patch in entries
+        )
+        with _file_entries_lock:
+            text = _file_entries_cache.get(key)
+            if text is not None:
+                _file_entries_cache.move_to_end(key)
+        
+        if text is None:
+            text = _format_file_entries(entries)
+            with _file_entries_lock:
+                _file_entries_cache[key] = text
+                if len(_file_entries_cache) > _FILE_ENTRIES_CACHE_SIZE:
+                    _file_entries_cache.popitem(last=False)
+        
+        buf.write(text)
+
+    def _format_comments(self, buf: io.StringIO, comments: List[Dict]) -> None:
+        """Write PR comments for the prompt into buf"""
         if not comments:
-            return "No comments found"
+            buf.write("No comments found")
+            return
             
-        formatted = "Discussion Context:\n"
-        for comment in comments[:5]:  # Limit to 5 most recent comments
-            formatted += f"\n{comment['user']} wrote:\n{comment['body']}\n"
-        return formatted
+        buf.write("Discussion Context:\n")
+        # Limit to 5 most recent comments
+        for comment in itertools.islice(comments, 5):
+            buf.write(f"\n{comment['user']} wrote:\n{comment['body']}\n")
 
-    def _format_dependency_analysis(self, analysis: Dict) -> str:
-        """Format dependency analysis results"""
+    def _format_dependency_analysis(self, buf: io.StringIO, analysis: Dict) -> None:
+        """Write dependency analysis results into buf"""
         if not analysis or analysis.get('error'):
-            return "Dependency analysis not available"
+            buf.write("Dependency analysis not available")
+            return
             
-        circular_deps = analysis.get('circular_dependencies', [])
-        external_deps = analysis.get('external_dependencies', [])
-        
-        formatted = "Dependency Analysis Results:\n"
-        
-        if circular_deps:
-            formatted += "\nCircular Dependencies Found:\n"
-            for cycle in circular_deps:
-                formatted += f"- {' -> '.join(cycle)}\n"
-        else:
-            formatted += "\nNo circular dependencies found.\n"
-        
-        if external_deps:
-            formatted += "\nExternal Dependencies:\n"
-            for dep in external_deps:
-                formatted += f"- {dep}\n"
-        else:
-            formatted += "\nNo external dependencies found.\n"
-        return formatted
-
-    def _format_documentation_analysis(self, analysis: Dict) -> str:
-        """Format documentation analysis results"""
+        buf.write("Dependency Analysis Results:\n")
+        buf.write(_dumps_json({
+            'circular_dependencies': analysis.get('circular_dependencies', []),
+            'external_dependencies': analysis.get('external_dependencies', [])
+        }, indent=True))
+
+    def _format_documentation_analysis(self, buf: io.StringIO, analysis: Dict) -> None:
+        """Write documentation analysis results into buf"""
         if not analysis or not isinstance(analysis, dict):
-            return "Documentation analysis not available"
+            buf.write("Documentation analysis not available")
+            return
             
         documentation = analysis.get('documentation', {})
-        stats = analysis.get('stats', {})
         
-        formatted = "Documentation Analysis Results:\n"
+        # Only send the documented/undocumented flags, not the docstrings themselves
+        per_file = {
+            filename: {
+                'coverage': doc_info.get('coverage', 0),
+                'quality_score': doc_info.get('quality_score', 0),
+                'classes': {
+                    name: bool(info.get('docstring'))
+                    for name, info in (doc_info.get('classes') or {}).items()
+                },
+                'functions': {
+                    name: bool(info.get('docstring'))
+                    for name, info in (doc_info.get('functions') or {}).items()
+                }
+            }
+            for filename, doc_info in documentation.items()
+            if isinstance(doc_info, dict) and 'error' not in doc_info
+        }
         
-        if stats:
-            formatted += f"\nOverall Statistics:\n"
-            formatted += f"- Total Files: {stats.get('total_files_analyzed', 0)}\n"
-            formatted += f"- Average Coverage: {stats.get('average_coverage', 0)}%\n"
-            formatted += f"- Average Quality: {stats.get('average_quality', 0)}%\n"
-            formatted += f"- Well Documented Files: {stats.get('well_documented_files', 0)}\n"
-            formatted += f"- Need Improvement: {stats.get('needs_improvement', 0)}\n"
-            
-        if documentation:
-            formatted += "\nPer-file Documentation:\n"
-            for filename, doc_info in documentation.items():
-                if isinstance(doc_info, dict) and 'error' not in doc_info:
-                    formatted += f"\n{filename}:\n"
-                    formatted += f"- Coverage: {doc_info.get('coverage', 0)}%\n"
-                    formatted += f"- Quality Score: {doc_info.get('quality_score', 0)}%\n"
-                    
-                    # Add class documentation info
-                    if doc_info.get('classes'):
-                        formatted += "- Documented Classes:\n"
-                        for class_name, class_info in doc_info['classes'].items():
-                            formatted += f"  • {class_name}: {'Documented' if class_info.get('docstring') else 'Undocumented'}\n"
-                    
-                    # Add function documentation info
-                    if doc_info.get('functions'):
-                        formatted += "- Documented Functions:\n"
-                        for func_name, func_info in doc_info['functions'].items():
-                            formatted += f"  • {func_name}: {'Documented' if func_info.get('docstring') else 'Undocumented'}\n"
-                            
-        return formatted
+        buf.write("Documentation Analysis Results:\n")
+        buf.write(_dumps_json({
+            'stats': analysis.get('stats', {}),
+            'files': per_file
+        }, indent=True))
         
     def analyze_pr_sync(self, context: Dict) -> Dict:
         """Synchronous version of analyze_pr method.
@@ -522,13 +545,57 @@ Structure your response using HTML with Bootstrap classes:
             return self.mock_review(context, mock_reason)
             
         try:
-            # Add dependency, code structure, and documentation analysis
-            if 'files' in context:
+            self._prepare_context(context)
+            
+            logger.info("Building analysis prompt")
+            prompt = self._build_analysis_prompt(context)
+            
+            logger.info("Sending request to Claude API")
+            if not self.client:
+                raise ValueError("Claude API client not initialized")
+                
+            response = self.client.messages.create(
+                model="claude-3-sonnet-20240229",
+                max_tokens=4096,
+                messages=[{
+                    "role": "user",
+                    "content": prompt
+                }],
+                temperature=0.7,
+                system="You are a code review expert. Analyze pull requests thoroughly and provide constructive feedback focusing on code quality, security, and best practices."
+            )
+            
+            logger.info("Successfully received response from Claude API")
+            return self._parse_claude_response(response)
+            
+        except Exception as e:
+            logger.error(f"Error during PR analysis: {str(e)}")
+            error_msg = f"Analysis error: {str(e)}"
+            return self.mock_review(context, error_msg)
+
+    def _prepare_context(self, context: Dict) -> None:
+        """Add dependency, code structure, and documentation analysis to the context"""
+        if 'files' in context:
+            # Structure and documentation parsers only understand source code
+            source_files = [
+                f for f in context['files']
+                if os.path.splitext(f['filename'])[1].lower() in SOURCE_EXTENSIONS
+            ]
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Dependency analysis mostly waits on external tools, so it runs
+                # alongside the in-process analyses below
+                dependency_future = None
+                if self.dependency_service:
+                    logger.info("Running dependency analysis")
+                    dependency_future = executor.submit(
+                        self.dependency_service.analyze_dependencies, context['files'])
+
                 # Parse documentation
                 logger.info("Running documentation analysis")
                 try:
                     doc_analysis = self.doc_parser.execute_sync({
-                        'files': [{'filename': f['filename'], 'content': f.get('content', '')} for f in context['files']]
+                        'files': [{'filename': f['filename'], 'content': f.get('content', '')} for f in source_files]
                     })
                     context['documentation_analysis'] = doc_analysis
                     logger.info("Documentation analysis completed successfully")
@@ -546,61 +613,28 @@ Structure your response using HTML with Bootstrap classes:
                     logger.error(f"Language Determination: Failed to detect languages: {str(e)}")
                     context['language_detection'] = None
                 
-                # Run dependency analysis if available
-                if self.dependency_service:
-                    logger.info("Running dependency analysis")
-                    dependency_analysis = self.dependency_service.analyze_dependencies(context['files'])
-                    context['dependency_analysis'] = dependency_analysis
-                
                 # Run code structure analysis if available
                 if self.code_structure_service:
                     logger.info("Running code structure analysis")
-                    structure_analysis = {}
-                    for file in context['files']:
+                    totals = []
+                    for file in source_files:
                         try:
                             analysis = self.code_structure_service.analyze_code(
                                 file.get('content', ''),
                                 file['filename']
                             )
                             if isinstance(analysis, dict):
-                                structure_analysis[file['filename']] = analysis
+                                total = analysis.get('total_complexity') or _EMPTY_METRICS
                             else:
-                                structure_analysis[file['filename']] = {
-                                    'structures': getattr(analysis, 'structures', []),
-                                    'imports': getattr(analysis, 'imports', []),
-                                    'total_complexity': getattr(analysis, 'total_complexity', {})
-                                }
+                                total = getattr(analysis, 'total_complexity', None) or _EMPTY_METRICS
+                            totals.append((file['filename'], total))
                         except Exception as e:
                             logger.error(f"Error analyzing {file['filename']}: {str(e)}")
-                    context['structure_analysis'] = structure_analysis
-            
-            logger.info("Building analysis prompt")
-            prompt = self._build_analysis_prompt(context)
-            
-            logger.info("Sending request to Claude API")
-            if not self.client:
-                raise ValueError("Claude API client not initialized")
-                
-            response = self.client.messages.create(
-                model="claude-3-sonnet-20240229",
-                max_tokens=4096,
-                messages=[{
-                    "role": "user",
-                    "content": prompt
-                }],
-                temperature=0.7,
-                system="You are a code review expert. Analyze pull requests thoroughly and provide constructive feedback focusing on code quality, security, and best practices."
-            )
-            
-            logger.info("Successfully received response from Claude API")
-            return self._parse_claude_response(response)
-            
-        except Exception as e:
-            logger.error(f"Error during PR analysis: {str(e)}")
-            error_msg = f"Analysis error: {str(e)}"
-            return self.mock_review(context, error_msg)
-                    
-    
+                    context['structure_analysis'] = build_structure_metrics(totals)
+
+                if dependency_future is not None:
+                    context['dependency_analysis'] = dependency_future.result()
+
     def _parse_claude_response(self, response: Any) -> Dict:
         """Parses Claude's response with enhanced validation and error handling"""
         try:
@@ -619,11 +653,14 @@ Structure your response using HTML with Bootstrap classes:
                 content = response.get('content', '') if isinstance(response, dict) else str(response)
             
             # Clean up response content
-            content = re.sub(r"^Here's the code review feedback.*?:\s*", "", content, flags=re.IGNORECASE).strip()
-            content = re.sub(r'```html\s*|\s*```$', '', content, flags=re.IGNORECASE).strip()
+            content = _RESPONSE_PREAMBLE_RE.sub("", content).strip()
+            if '```' in content:
+                content = _CODE_FENCE_RE.sub('', content).strip()
             
-            # Ensure proper HTML structure
-            if not ('<div' in content and '</div>' in content):
+            # Ensure proper HTML structure; the closing tag must follow the opening one
+            div_start = content.find('<div')
+            has_div = div_start != -1 and content.find('</div>', div_start) != -1
+            if not has_div:
                 logger.warning("Adding HTML structure to response")
                 content = f'''
                 <div class="code-review">
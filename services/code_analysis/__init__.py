@@ -1,8 +1,9 @@
 """Code analysis package for PR review assistant."""
-from .base import CodeAnalyzerBase, DocumentationMetrics, LanguageConfig
+from .base import AnalysisResult, CodeAnalyzerBase, DocumentationMetrics, LanguageConfig
 from .metrics import ComplexityMetrics, SecurityMetrics, PerformanceMetrics
 
 __all__ = [
+    'AnalysisResult',
     'CodeAnalyzerBase',
     'DocumentationMetrics',
     'LanguageConfig',
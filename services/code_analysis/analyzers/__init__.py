@@ -2,5 +2,6 @@
 from .documentation_analyzer import DocumentationAnalyzer
 from .python_analyzer import PythonAnalyzer
 from .javascript_analyzer import JavaScriptAnalyzer
+from .batch import analyze_files
 
-__all__ = ['DocumentationAnalyzer', 'PythonAnalyzer', 'JavaScriptAnalyzer']
+__all__ = ['DocumentationAnalyzer', 'PythonAnalyzer', 'JavaScriptAnalyzer', 'analyze_files']
@@ -0,0 +1,40 @@
+"""Process-pool fan-out shared by the batch analysis entry points."""
+from typing import Callable, List, Optional, Sequence, TypeVar
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar('T')
+R = TypeVar('R')
+
+# Below this many items, starting worker processes costs more than it saves
+MIN_POOL_ITEMS = 8
+
+def map_in_processes(func: Callable[[T], R], items: Sequence[T], chunksize: int = 1,
+                     inline: Optional[Callable[[T], R]] = None) -> List[R]:
+    """Apply func to every item, in worker processes when the batch is large enough.
+
+    The pool lives only for this call, and its workers are spawned rather than
+    forked so they never inherit locks held by other threads of a web server.
+
+    Args:
+        func: Picklable module-level function run in the workers
+        items: Inputs, each passed to func
+        chunksize: Items sent to a worker at a time
+        inline: Used instead of func for batches too small for a pool;
+            defaults to func
+
+    Returns:
+        Results in input order
+    """
+    if len(items) < MIN_POOL_ITEMS:
+        return [(inline or func)(item) for item in items]
+
+    workers = min(os.cpu_count() or 1, -(-len(items) // chunksize))
+    logger.info("Analyzing %d files across %d worker processes", len(items), workers)
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context('spawn')) as executor:
+        return list(executor.map(func, items, chunksize=chunksize))
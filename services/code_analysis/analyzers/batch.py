@@ -0,0 +1,45 @@
+"""Parallel analysis of many files across worker processes."""
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+from pathlib import Path
+from .python_analyzer import PythonAnalyzer
+from .javascript_analyzer import JavaScriptAnalyzer
+from ._parallel import map_in_processes
+
+logger = logging.getLogger(__name__)
+
+# Analyzer class for each supported file extension
+ANALYZERS_BY_EXTENSION = {
+    '.py': PythonAnalyzer,
+    '.js': JavaScriptAnalyzer,
+    '.jsx': JavaScriptAnalyzer,
+    '.ts': JavaScriptAnalyzer,
+    '.tsx': JavaScriptAnalyzer
+}
+
+# Analyzers built lazily inside each worker process and reused for its files
+_worker_analyzers: Dict[type, Any] = {}
+
+def _analyze_item(item: Tuple[str, str]) -> Optional[Any]:
+    """Analyze one (content, filename) pair with the analyzer for its extension."""
+    content, filename = item
+    analyzer_cls = ANALYZERS_BY_EXTENSION.get(Path(filename).suffix.lower())
+    if analyzer_cls is None:
+        return None
+
+    analyzer = _worker_analyzers.get(analyzer_cls)
+    if analyzer is None:
+        analyzer = _worker_analyzers[analyzer_cls] = analyzer_cls()
+    return analyzer.analyze_code(content, filename)
+
+def analyze_files(items: List[Tuple[str, str]]) -> List[Optional[Any]]:
+    """Analyze many files, across worker processes when there are enough of them.
+
+    Args:
+        items: (content, filename) pairs to analyze
+
+    Returns:
+        Analysis result for each item in input order, or None for
+        unsupported file types
+    """
+    return map_in_processes(_analyze_item, items, chunksize=8)
@@ -1,26 +1,21 @@
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple, Union
 import logging
+import functools
+import hashlib
+from collections import OrderedDict, deque
 import re
 import ast
-from dataclasses import dataclass, field
+import dataclasses
+import sys
+import threading
 from pathlib import Path
-from ..base import DocumentationMetrics
-
-@dataclass
-class DocumentationMetrics:
-    """Documentation analysis metrics"""
-    coverage: float = 0.0
-    quality_score: float = 0.0
-    module_doc: Optional[str] = None
-    classes: Dict[str, Dict] = field(default_factory=dict)
-    functions: Dict[str, Dict] = field(default_factory=dict)
-    error: Optional[str] = None
-
-    def __post_init__(self):
-        if self.classes is None:
-            self.classes = {}
-        if self.functions is None:
-            self.functions = {}
+from ..base import DocumentationMetrics, FrozenDict
+from ._parallel import map_in_processes
+
+try:
+    from plugins.documentation_parser import DocumentationParser
+except ImportError:
+    DocumentationParser = None
 
 # Configure logging
 logging.basicConfig(
@@ -29,14 +24,94 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# JSDoc patterns, compiled once at import
+# A JSDoc block together with the declaration it documents, if any
+_JSDOC_AND_DECL_RE = re.compile(
+    r'/\*\*\s*(?P<doc>.*?)\s*\*/\s*'
+    r'(?:class\s+(?P<class_name>\w+)'
+    r'|(?:async\s+)?function\s+(?P<function_name>\w+)'
+    r'|const\s+(?P<const_name>\w+)\s*=\s*(?:async\s+)?\()?',
+    re.DOTALL
+)
+# Directories holding vendored, generated or cached files
+_SKIPPED_DIRS = frozenset(('node_modules', '.venv', 'venv', 'dist', 'build', '__pycache__'))
+
+_PARAM_RE = re.compile(r'@param\s+{[^}]+}\s+(\w+)')
+_RETURNS_RE = re.compile(r'@returns?\s+{([^}]+)}')
+
+def _content_digest(content: str) -> bytes:
+    """Return a 128-bit digest of source text for use as a cache key."""
+    return hashlib.blake2b(content.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+# Recently parsed trees keyed by source digest, so the sources themselves are not kept alive
+_PARSE_CACHE_SIZE = 64
+_parse_cache: "OrderedDict[bytes, ast.Module]" = OrderedDict()
+_parse_cache_lock = threading.Lock()
+
+def parse_python_source(content: str) -> ast.Module:
+    """Parse Python source, reusing the tree when the same content was parsed recently.
+    
+    The returned tree is shared between callers and must not be modified.
+    """
+    digest = _content_digest(content)
+    with _parse_cache_lock:
+        tree = _parse_cache.get(digest)
+        if tree is not None:
+            _parse_cache.move_to_end(digest)
+            return tree
+            
+    tree = ast.parse(content)
+    with _parse_cache_lock:
+        _parse_cache[digest] = tree
+        if len(_parse_cache) > _PARSE_CACHE_SIZE:
+            _parse_cache.popitem(last=False)
+    return tree
+
+# Fields holding nested statement blocks, in the order ast.walk visits them
+_BLOCK_FIELDS = ('body', 'handlers', 'orelse', 'finalbody', 'cases')
+
+def walk_statements(tree: ast.AST) -> Iterator[ast.AST]:
+    """Yield the statement-level nodes of tree in ast.walk order.
+    
+    Class, function and import definitions only occur as statements, so
+    expressions are never descended into.
+    """
+    queue = deque([tree])
+    while queue:
+        node = queue.popleft()
+        yield node
+        for name in _BLOCK_FIELDS:
+            block = getattr(node, name, None)
+            if block:
+                queue.extend(block)
+
+# Per-process analyzer used by analyze_many workers
+_worker_analyzer = None
+
+def _analyze_one(item: Tuple[str, str]) -> DocumentationMetrics:
+    """Analyze a single (content, filename) pair in a worker process."""
+    global _worker_analyzer
+    if _worker_analyzer is None:
+        _worker_analyzer = DocumentationAnalyzer()
+    content, filename = item
+    return _worker_analyzer.analyze_documentation(content, filename)
+
 class DocumentationAnalyzer:
     """Analyzer for documentation quality and coverage."""
     
+    # Metrics kept for recently analyzed (content, extension) pairs
+    CACHE_SIZE = 512
+    
+    # Files larger than this are bundles or generated code, not documented source
+    MAX_FILE_SIZE = 1024 * 1024
+    
     def __init__(self):
         """Initialize the documentation analyzer."""
         self.doc_parser = None
         self.initialized = False
         self.initialization_error = None
+        self._metrics_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
     
     def initialize(self) -> None:
         """Initialize the analyzer."""
@@ -49,7 +124,7 @@ class DocumentationAnalyzer:
             logger.info("Documentation analyzer initialized successfully")
         except Exception as e:
             self.initialization_error = str(e)
-            logger.error(f"Failed to initialize documentation analyzer: {str(e)}")
+            logger.error("Failed to initialize documentation analyzer: %s", e)
             raise
             
     def _initialize_parser(self) -> None:
@@ -57,150 +132,274 @@ class DocumentationAnalyzer:
         if self.doc_parser is not None:
             return
             
+        if DocumentationParser is None:
+            logger.error("Documentation parser module not found")
+            raise ImportError("plugins.documentation_parser is not available")
+            
         try:
-            from plugins.documentation_parser import DocumentationParser
             self.doc_parser = DocumentationParser()
             self.doc_parser.initialize()
             logger.info("Documentation parser initialized successfully")
-        except ImportError as e:
-            logger.error(f"Documentation parser module not found: {str(e)}")
-            raise
         except Exception as e:
-            logger.error(f"Failed to initialize documentation parser: {str(e)}")
+            logger.error("Failed to initialize documentation parser: %s", e)
             raise
             
-    def analyze_documentation(self, content: str, filename: str) -> DocumentationMetrics:
+    def analyze_documentation(self, content: str, filename: str,
+                              definitions: Optional[Iterable[ast.AST]] = None) -> DocumentationMetrics:
         """Analyze documentation quality and coverage with multi-language support.
         
         Args:
             content: Source code content to analyze
             filename: Name of the file being analyzed
+            definitions: Class and function definitions of a Python file, already
+                collected by the caller's own walk of its parsed tree
             
         Returns:
-            DocumentationMetrics containing analysis results
+            DocumentationMetrics containing analysis results, shared with other
+            callers analyzing the same content
         """
         try:
             if not self.initialized:
                 self.initialize()
 
+            # Vendored, minified and empty package files contribute no documentation
+            path = Path(filename)
+            if self._should_skip(path, content):
+                return self._empty_doc_metrics(f'Skipped: {filename}')
+
             # Determine file type and use appropriate parser
-            ext = Path(filename).suffix.lower()
+            ext = path.suffix.lower()
             if ext in ['.py']:
-                return self._analyze_python_docs(content)
+                analyze = functools.partial(self._analyze_python_docs, nodes=definitions)
             elif ext in ['.js', '.jsx', '.ts', '.tsx']:
-                return self._analyze_jsdoc(content)
+                analyze = self._analyze_jsdoc
             else:
                 return self._empty_doc_metrics(f'Unsupported file type: {ext}')
 
+            # Unchanged files across PR re-runs skip analysis entirely
+            cache_key = (_content_digest(content), ext)
+            metrics = self._get_cached(cache_key)
+            if metrics is not None:
+                return metrics
+                
+            metrics = analyze(content)
+            self._store_cached(cache_key, metrics)
+            return metrics
+
         except Exception as e:
-            logger.error(f"Documentation analysis failed: {str(e)}")
+            logger.error("Documentation analysis failed: %s", e)
             return self._empty_doc_metrics(str(e))
 
-    def _analyze_python_docs(self, content: str) -> DocumentationMetrics:
+    def _get_cached(self, cache_key: Tuple[bytes, str]) -> Optional[DocumentationMetrics]:
+        """Return the cached metrics for cache_key, marking them recently used.
+        
+        Metrics are immutable, so every hit can share the same object.
+        """
+        with self._cache_lock:
+            metrics = self._metrics_cache.get(cache_key)
+            if metrics is not None:
+                self._metrics_cache.move_to_end(cache_key)
+            return metrics
+        
+    def _store_cached(self, cache_key: Tuple[bytes, str], metrics: DocumentationMetrics) -> None:
+        """Cache successful metrics, evicting the least recently used entry when full.
+        
+        Results carrying an error are never cached, so a failed analysis is
+        retried on the next request.
+        """
+        if metrics.error is not None:
+            return
+        with self._cache_lock:
+            self._metrics_cache[cache_key] = metrics
+            if len(self._metrics_cache) > self.CACHE_SIZE:
+                self._metrics_cache.popitem(last=False)
+            
+    def _should_skip(self, path: Path, content: str) -> bool:
+        """Check whether a file should be left out of documentation analysis."""
+        if _SKIPPED_DIRS.intersection(path.parts[:-1]):
+            return True
+        if path.name.endswith('.min.js') or len(content) > self.MAX_FILE_SIZE:
+            return True
+        return path.name == '__init__.py' and not content.strip()
+
+    def analyze_many(self, files: List[Tuple[str, str]]) -> List[DocumentationMetrics]:
+        """Analyze several files in parallel across worker processes.
+        
+        Args:
+            files: (content, filename) pairs to analyze
+            
+        Returns:
+            DocumentationMetrics for each file, in input order
+        """
+        results: List[Optional[DocumentationMetrics]] = [None] * len(files)
+        misses = []
+        keys = {}
+        for index, (content, filename) in enumerate(files):
+            cache_key = (_content_digest(content), Path(filename).suffix.lower())
+            metrics = self._get_cached(cache_key)
+            if metrics is None:
+                misses.append(index)
+                keys[index] = cache_key
+            else:
+                results[index] = metrics
+                
+        # Only files not analyzed before are worth shipping to another process
+        pending = [files[index] for index in misses]
+        analyzed = map_in_processes(_analyze_one, pending, chunksize=4,
+                                    inline=lambda item: self.analyze_documentation(*item))
+        for index, metrics in zip(misses, analyzed):
+            results[index] = metrics
+            self._store_cached(keys[index], metrics)
+        return results
+
+    def _analyze_python_docs(self, content: str,
+                             nodes: Optional[Iterable[ast.AST]] = None) -> DocumentationMetrics:
         """Analyze Python documentation using AST."""
         try:
-            tree = ast.parse(content)
-            metrics = DocumentationMetrics()
+            return self.analyze_documentation_from_ast(parse_python_source(content), nodes)
+        except Exception as e:
+            logger.error("Python documentation analysis failed: %s", e)
+            return self._empty_doc_metrics(str(e))
+
+    def analyze_documentation_from_ast(self, tree: ast.Module,
+                                       nodes: Optional[Iterable[ast.AST]] = None) -> DocumentationMetrics:
+        """Analyze documentation of an already parsed Python module.
+        
+        Only the tree is available here, not the filename or source, so the
+        skip and size guards and the metrics cache do not apply. Callers with
+        the source should use analyze_documentation, which applies all three.
+        
+        Args:
+            tree: Parsed module
+            nodes: Class and function definitions collected by the caller's own
+                walk of tree; the tree is walked here when omitted
             
-            # Get module docstring
-            metrics.module_doc = ast.get_docstring(tree)
+        Returns:
+            DocumentationMetrics containing analysis results
+        """
+        try:
+            classes = {}
+            functions = {}
             
-            for node in ast.walk(tree):
+            # Interned names are shared across files instead of copied per parse
+            for node in (walk_statements(tree) if nodes is None else nodes):
                 if isinstance(node, ast.ClassDef):
                     class_doc = ast.get_docstring(node)
                     methods = {}
                     
                     for child in node.body:
                         if isinstance(child, ast.FunctionDef):
-                            methods[child.name] = {
-                                'docstring': ast.get_docstring(child),
-                                'args': [arg.arg for arg in child.args.args],
-                                'returns': self._extract_return_info(child)
-                            }
+                            methods[sys.intern(child.name)] = FrozenDict(
+                                docstring=ast.get_docstring(child),
+                                args=tuple(arg.arg for arg in child.args.args),
+                                returns=self._extract_return_info(child)
+                            )
                             
-                    metrics.classes[node.name] = {
-                        'docstring': class_doc,
-                        'methods': methods
-                    }
+                    classes[sys.intern(node.name)] = FrozenDict(
+                        docstring=class_doc,
+                        methods=FrozenDict(methods)
+                    )
                     
                 elif isinstance(node, ast.FunctionDef):
-                    metrics.functions[node.name] = {
-                        'docstring': ast.get_docstring(node),
-                        'args': [arg.arg for arg in node.args.args],
-                        'returns': self._extract_return_info(node)
-                    }
+                    functions[sys.intern(node.name)] = FrozenDict(
+                        docstring=ast.get_docstring(node),
+                        args=tuple(arg.arg for arg in node.args.args),
+                        returns=self._extract_return_info(node)
+                    )
                     
-            self._calculate_metrics(metrics)
-            return metrics
+            return self._build_metrics(ast.get_docstring(tree), classes, functions)
             
         except Exception as e:
-            logger.error(f"Python documentation analysis failed: {str(e)}")
+            logger.error("Python documentation analysis failed: %s", e)
             return self._empty_doc_metrics(str(e))
 
     def _analyze_jsdoc(self, content: str) -> DocumentationMetrics:
         """Analyze JSDoc documentation using regex patterns."""
         try:
-            metrics = DocumentationMetrics()
-            
-            # Match JSDoc blocks
-            jsdoc_pattern = r'/\*\*\s*(.*?)\s*\*/'
-            class_pattern = r'class\s+(\w+)'
-            function_pattern = r'(async\s+)?function\s+(\w+)|const\s+(\w+)\s*=\s*(async\s+)?\('
+            module_doc = None
+            classes = {}
+            functions = {}
             
-            # Find all JSDoc blocks
-            matches = list(re.finditer(jsdoc_pattern, content, re.DOTALL))
-            
-            for i, match in enumerate(matches):
-                doc_block = match.group(1)
-                next_code = content[match.end():].strip()
+            # Most bundles and generated files carry no JSDoc at all
+            if '/**' not in content:
+                return self._build_metrics(module_doc, classes, functions)
+                
+            # Each match carries the block and the name of the declaration following it
+            for i, match in enumerate(_JSDOC_AND_DECL_RE.finditer(content)):
+                doc_block = match.group('doc')
                 
-                if re.match(class_pattern, next_code):
-                    class_name = re.match(class_pattern, next_code).group(1)
-                    metrics.classes[class_name] = {
-                        'docstring': doc_block,
-                        'methods': {}
-                    }
-                elif re.match(function_pattern, next_code):
-                    func_match = re.match(function_pattern, next_code)
-                    func_name = func_match.group(2) or func_match.group(3)
-                    metrics.functions[func_name] = {
-                        'docstring': doc_block,
-                        'args': self._extract_jsdoc_params(doc_block),
-                        'returns': self._extract_jsdoc_returns(doc_block)
-                    }
-                elif i == 0 and not metrics.module_doc:
-                    metrics.module_doc = doc_block
+                if class_name := match.group('class_name'):
+                    classes[sys.intern(class_name)] = FrozenDict(
+                        docstring=doc_block,
+                        methods=FrozenDict()
+                    )
+                elif func_name := match.group('function_name') or match.group('const_name'):
+                    functions[sys.intern(func_name)] = FrozenDict(
+                        docstring=doc_block,
+                        args=self._extract_jsdoc_params(doc_block),
+                        returns=self._extract_jsdoc_returns(doc_block)
+                    )
+                elif i == 0 and not module_doc:
+                    module_doc = doc_block
                     
-            self._calculate_metrics(metrics)
-            return metrics
+            return self._build_metrics(module_doc, classes, functions)
             
         except Exception as e:
-            logger.error(f"JSDoc analysis failed: {str(e)}")
+            logger.error("JSDoc analysis failed: %s", e)
             return self._empty_doc_metrics(str(e))
 
     def _extract_return_info(self, node: ast.FunctionDef) -> Optional[str]:
         """Extract return type information from function definition."""
-        returns = None
-        if node.returns:
-            returns = ast.unparse(node.returns)
-        return returns
+        returns = node.returns
+        if not returns:
+            return None
+            
+        # Plain and dotted names (int, Optional, ast.AST) and None cover most
+        # annotations; only subscripts and other expressions need the unparser
+        if isinstance(returns, ast.Name):
+            return returns.id
+        if isinstance(returns, ast.Constant) and returns.value is None:
+            return 'None'
+        if isinstance(returns, ast.Attribute):
+            parts = [returns.attr]
+            value = returns.value
+            while isinstance(value, ast.Attribute):
+                parts.append(value.attr)
+                value = value.value
+            if isinstance(value, ast.Name):
+                parts.append(value.id)
+                return '.'.join(reversed(parts))
+        return ast.unparse(returns)
 
-    def _extract_jsdoc_params(self, docstring: str) -> List[str]:
+    def _extract_jsdoc_params(self, docstring: str) -> Tuple[str, ...]:
         """Extract parameter names from JSDoc @param tags."""
-        params = []
-        param_pattern = r'@param\s+{[^}]+}\s+(\w+)'
-        for match in re.finditer(param_pattern, docstring):
-            params.append(match.group(1))
-        return params
+        if '@param' not in docstring:
+            return ()
+        return tuple(_PARAM_RE.findall(docstring))
 
     def _extract_jsdoc_returns(self, docstring: str) -> Optional[str]:
         """Extract return type from JSDoc @returns tag."""
-        returns_pattern = r'@returns?\s+{([^}]+)}'
-        match = re.search(returns_pattern, docstring)
+        if '@return' not in docstring:
+            return None
+        match = _RETURNS_RE.search(docstring)
         return match.group(1) if match else None
 
-    def _calculate_metrics(self, metrics: DocumentationMetrics) -> None:
-        """Calculate coverage and quality scores."""
+    def _build_metrics(self, module_doc: Optional[str], classes: Dict[str, Dict],
+                       functions: Dict[str, Dict]) -> DocumentationMetrics:
+        """Freeze collected documentation into metrics with coverage and quality scores."""
+        metrics = DocumentationMetrics(
+            module_doc=module_doc,
+            classes=FrozenDict(classes),
+            functions=FrozenDict(functions)
+        )
+        return dataclasses.replace(
+            metrics,
+            coverage=self._calculate_coverage(metrics),
+            quality_score=self._calculate_quality_score(metrics)
+        )
+        
+    def _calculate_coverage(self, metrics: DocumentationMetrics) -> float:
+        """Percentage of the module, classes, methods and functions that are documented."""
         total_elements = 1  # Module
         documented_elements = 1 if metrics.module_doc else 0
         
@@ -221,15 +420,30 @@ class DocumentationAnalyzer:
             if func_info['docstring']:
                 documented_elements += 1
         
-        metrics.coverage = (documented_elements / total_elements * 100) if total_elements > 0 else 0
-        metrics.quality_score = self._calculate_quality_score(metrics)
+        return (documented_elements / total_elements * 100) if total_elements > 0 else 0
+            
+    def _calculate_quality_score(self, metrics: DocumentationMetrics) -> float:
+        """Score documented elements by description length and param/return tags."""
+        docstrings = [metrics.module_doc]
+        for class_info in metrics.classes.values():
+            docstrings.append(class_info['docstring'])
+            docstrings.extend(method_info.get('docstring')
+                              for method_info in class_info.get('methods', {}).values())
+        docstrings.extend(func_info['docstring'] for func_info in metrics.functions.values())
+        
+        scores = []
+        for docstring in filter(None, docstrings):
+            score = min(len(docstring.split()) / 10, 1)
+            score += 0.5 if ':param' in docstring or '@param' in docstring else 0
+            score += 0.5 if ':return' in docstring or '@return' in docstring else 0
+            scores.append(min(score, 1) * 100)
+        
+        return round(sum(scores) / len(scores), 2) if scores else 0.0
             
     def _empty_doc_metrics(self, error_message: Optional[str] = None) -> DocumentationMetrics:
         """Create empty documentation metrics."""
         return DocumentationMetrics(
             module_doc=None,
-            classes={},
-            functions={},
             coverage=0.0,
             quality_score=0.0,
             error=error_message if error_message else 'No documentation available'
@@ -1,49 +1,57 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Tuple
 import re
 import logging
-from ..base import CodeAnalyzerBase
+from collections import Counter
+from itertools import accumulate
+from operator import sub
+from ..base import AnalysisResult, CodeAnalyzerBase
 from ..metrics.complexity import ComplexityMetrics
 from .documentation_analyzer import DocumentationAnalyzer
 
 logger = logging.getLogger(__name__)
 
-# Define AnalysisResult locally
-class AnalysisResult:
-    """Result of code structure analysis"""
-    def __init__(self, structures: List[Dict], imports: List[str], total_complexity: ComplexityMetrics,
-                 documentation_metrics: Dict[str, Any] = None):
-        self.structures = structures
-        self.imports = imports
-        self.total_complexity = total_complexity
-        self.documentation_metrics = documentation_metrics
+# Imports and the && / || decision operators are found in a single pass over the source.
+# An import clause stops at the first "from '...'" within its statement, so a match
+# never swallows the requires and operators that follow it on a minified line.
+_JS_SCAN_RE = re.compile(
+    r'import\s+[^;\n]*?\s+from\s+[\'"](?P<from_import>[^\'"]+)[\'"]'
+    r'|require\([\'"](?P<require>[^\'"]+)[\'"]\)'
+    r'|import\([\'"](?P<dynamic_import>[^\'"]+)[\'"]\)'
+    r'|\b(?P<operator>&&|\|\|)\b'
+)
+
+# Keyword decision points are counted from one tokenization of the source
+_WORD_RE = re.compile(r'\w+')
+_BRANCH_KEYWORDS = frozenset({'if', 'while', 'for', 'switch'})
+
+# Brace scanning for nesting depth
+_BRACE_RE = re.compile(r'[{}]')
+_BRACE_DELTA = {'{': 1, '}': -1}
 
 class JavaScriptAnalyzer(CodeAnalyzerBase):
     """Analyzer for JavaScript/TypeScript code with documentation support."""
     
     def __init__(self):
-        self.doc_analyzer = DocumentationAnalyzer()
+        self._doc_analyzer = None
+        
+    @property
+    def doc_analyzer(self) -> DocumentationAnalyzer:
+        """Documentation analyzer, created on first use."""
+        if self._doc_analyzer is None:
+            self._doc_analyzer = DocumentationAnalyzer()
+        return self._doc_analyzer
         
     def analyze_code(self, content: str, filename: str) -> AnalysisResult:
         """Analyze JavaScript/TypeScript code structure."""
         try:
             # Basic structure analysis
             structures = []
-            imports = []
-
-            # Parse imports using regex
-            import_patterns = [
-                r'import\s+.*\s+from\s+[\'"]([^\'"]+)[\'"]',
-                r'require\([\'"]([^\'"]+)[\'"]\)',
-                r'import\([\'"]([^\'"]+)[\'"]\)'
-            ]
-
-            for pattern in import_patterns:
-                imports.extend(re.findall(pattern, content))
+            imports, branches, decisions = self._scan_source(content)
 
             # Calculate complexity metrics
             total_complexity = ComplexityMetrics(
-                cyclomatic_complexity=self._calculate_cyclomatic_complexity(content),
-                cognitive_complexity=self._calculate_cognitive_complexity(content),
+                cyclomatic_complexity=branches + decisions + 1,
+                cognitive_complexity=branches,
                 nesting_depth=self._calculate_nesting_depth(content),
                 maintainability_index=100.0  # Default value
             )
@@ -53,43 +61,39 @@ class JavaScriptAnalyzer(CodeAnalyzerBase):
 
             return AnalysisResult(
                 structures=structures,
-                imports=list(set(imports)),
+                imports=list(imports),
                 total_complexity=total_complexity,
                 documentation_metrics=doc_metrics
             )
 
         except Exception as e:
-            logger.error(f"Error analyzing JavaScript file {filename}: {str(e)}")
+            logger.error("Error analyzing JavaScript file %s: %s", filename, e)
             return self._empty_result()
 
-    def _calculate_cyclomatic_complexity(self, content: str) -> int:
-        """Calculate cyclomatic complexity for JavaScript code."""
-        # Count decision points
-        decision_points = len(re.findall(r'\b(if|while|for|switch|case|&&|\|\|)\b', content))
-        return decision_points + 1
-
-    def _calculate_cognitive_complexity(self, content: str) -> int:
-        """Calculate cognitive complexity for JavaScript code."""
-        return len(re.findall(r'\b(if|while|for|switch)\b', content))
+    def _scan_source(self, content: str) -> Tuple[Dict[str, None], int, int]:
+        """Collect imports and count complexity keywords and operators.
+        
+        Returns:
+            Tuple of (distinct imports in first-seen order, branch keyword count,
+            other decision point count)
+        """
+        word_counts = Counter(_WORD_RE.findall(content))
+        branches = sum(map(word_counts.__getitem__, _BRANCH_KEYWORDS))
+        decisions = word_counts['case']
+        
+        imports = {}
+        for match in _JS_SCAN_RE.finditer(content):
+            kind = match.lastgroup
+            if kind == 'operator':
+                decisions += 1
+            else:
+                imports[match.group(kind)] = None
+        return imports, branches, decisions
 
     def _calculate_nesting_depth(self, content: str) -> int:
         """Calculate maximum nesting depth in JavaScript code."""
-        max_depth = 0
-        current_depth = 0
-    def _empty_result(self) -> AnalysisResult:
-        """Return empty analysis result."""
-        return AnalysisResult(
-            structures=[],
-            imports=[],
-            total_complexity=ComplexityMetrics(),
-            documentation_metrics=None
-        )
-        
-        for char in content:
-            if char == '{':
-                current_depth += 1
-                max_depth = max(max_depth, current_depth)
-            elif char == '}':
-                current_depth = max(0, current_depth - 1)
-                
-        return max_depth
+        # Running depth is clamped at zero, so depth = prefix sum - lowest prefix sum so far
+        depths = list(accumulate(map(_BRACE_DELTA.__getitem__, _BRACE_RE.findall(content))))
+        if not depths:
+            return 0
+        return max(0, max(map(sub, depths, accumulate(depths, min, initial=0))))
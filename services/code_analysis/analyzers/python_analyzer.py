@@ -3,7 +3,7 @@ import ast
 import logging
 from ..base import CodeAnalyzerBase, AnalysisResult
 from ..metrics.complexity import ComplexityMetrics
-from .documentation_analyzer import DocumentationAnalyzer
+from .documentation_analyzer import DocumentationAnalyzer, parse_python_source, walk_statements
 
 logger = logging.getLogger(__name__)
 
@@ -11,20 +11,30 @@ class PythonAnalyzer(CodeAnalyzerBase):
     """Analyzer for Python code with enhanced documentation support."""
     
     def __init__(self):
-        self.doc_analyzer = DocumentationAnalyzer()
+        self._doc_analyzer = None
+        
+    @property
+    def doc_analyzer(self) -> DocumentationAnalyzer:
+        """Documentation analyzer, created on first use."""
+        if self._doc_analyzer is None:
+            self._doc_analyzer = DocumentationAnalyzer()
+        return self._doc_analyzer
         
     def analyze_code(self, content: str, filename: str) -> AnalysisResult:
         """Analyze Python code structure with enhanced documentation analysis"""
         try:
-            tree = ast.parse(content)
+            tree = parse_python_source(content)
             structures = []
             imports = []
             total_complexity = ComplexityMetrics()
+            definitions = []
 
             # Analyze each node
-            for node in ast.walk(tree):
+            for node in walk_statements(tree):
                 try:
                     if isinstance(node, (ast.ClassDef, ast.FunctionDef)):
+                        # Collected here so documentation analysis reuses this walk
+                        definitions.append(node)
                         complexity = self._calculate_complexity(node)
                         total_complexity.update(complexity)
 
@@ -49,11 +59,12 @@ class PythonAnalyzer(CodeAnalyzerBase):
                         imports.extend(self._extract_imports(node))
 
                 except Exception as e:
-                    logger.error(f"Error analyzing node in {filename}: {str(e)}")
+                    logger.error("Error analyzing node in %s: %s", filename, e)
                     continue
 
-            # Add documentation analysis
-            doc_metrics = self.doc_analyzer.analyze_documentation(content, filename)
+            # Documentation analysis reuses the parsed tree and collected definitions,
+            # and applies the same skip guards and cache as for any other file
+            doc_metrics = self.doc_analyzer.analyze_documentation(content, filename, definitions)
 
             return AnalysisResult(
                 structures=structures,
@@ -63,7 +74,7 @@ class PythonAnalyzer(CodeAnalyzerBase):
             )
 
         except Exception as e:
-            logger.error(f"Error in Python analysis for {filename}: {str(e)}")
+            logger.error("Error in Python analysis for %s: %s", filename, e)
             return self._empty_result()
 
     def _calculate_complexity(self, node: ast.AST) -> ComplexityMetrics:
@@ -2,10 +2,11 @@ from dataclasses import dataclass, field
 from typing import Dict, List, Optional, Any, Union
 from pathlib import Path
 import logging
+from .metrics.complexity import ComplexityMetrics
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@dataclass(slots=True)
 class LanguageConfig:
     """Configuration for language-specific analysis."""
     name: str
@@ -25,16 +26,40 @@ class LanguageConfig:
         'check_examples': True
     })
 
-@dataclass
+class FrozenDict(dict):
+    """Read-only dict for results shared between callers.
+    
+    Still a dict, so it serializes and passes isinstance checks like one.
+    """
+    __slots__ = ()
+    
+    def _read_only(self, *args, **kwargs):
+        raise TypeError(f"{type(self).__name__} is read-only")
+        
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+    
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+@dataclass(frozen=True, slots=True)
 class DocumentationMetrics:
-    """Documentation analysis metrics"""
+    """Documentation analysis metrics, immutable so cached results can be shared"""
     coverage: float = 0.0
     quality_score: float = 0.0
     module_doc: Optional[str] = None
-    classes: Dict[str, Dict] = field(default_factory=dict)
-    functions: Dict[str, Dict] = field(default_factory=dict)
+    classes: Dict[str, Dict] = field(default_factory=FrozenDict)
+    functions: Dict[str, Dict] = field(default_factory=FrozenDict)
     error: Optional[str] = None
 
+@dataclass(slots=True)
+class AnalysisResult:
+    """Result of code structure analysis"""
+    structures: List[Dict]
+    imports: List[str]
+    total_complexity: ComplexityMetrics
+    documentation_metrics: Optional[DocumentationMetrics] = None
+
 class CodeAnalyzerBase:
     """Base class for code analyzers"""
     
@@ -53,3 +78,11 @@ class CodeAnalyzerBase:
     def _empty_doc_metrics(self, error_message: Optional[str] = None) -> DocumentationMetrics:
         """Create empty documentation metrics."""
         return DocumentationMetrics(error=error_message)
+        
+    def _empty_result(self) -> AnalysisResult:
+        """Create an empty analysis result."""
+        return AnalysisResult(
+            structures=[],
+            imports=[],
+            total_complexity=ComplexityMetrics()
+        )
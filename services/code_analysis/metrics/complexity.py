@@ -1,7 +1,7 @@
 """Complexity metrics for code analysis."""
 from dataclasses import dataclass
 
-@dataclass
+@dataclass(slots=True)
 class ComplexityMetrics:
     """Complexity metrics for code analysis"""
     cyclomatic_complexity: int = 0
@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from typing import List, Optional
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance-related metrics"""
     memory_usage: Optional[float] = None
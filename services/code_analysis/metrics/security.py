@@ -2,7 +2,7 @@
 from dataclasses import dataclass, field
 from typing import List, Dict
 
-@dataclass
+@dataclass(slots=True)
 class SecurityMetrics:
     """Security-related metrics"""
     vulnerabilities: List[Dict] = field(default_factory=list)
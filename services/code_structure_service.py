@@ -10,6 +10,8 @@ import concurrent.futures
 import tempfile
 import subprocess
 import json
+import threading
+from collections import OrderedDict
 from functools import lru_cache
 
 # Configure logging
@@ -18,27 +20,9 @@ logging.basicConfig(
     format='%(asctime)s - %(name)s - %(levelname)s - [%(pathname)s:%(lineno)d] - %(message)s'
 )
 logger = logging.getLogger(__name__)
-import concurrent.futures
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, TypedDict, Union, Set, Any
-import ast
-import re
-import logging
-from dataclasses import dataclass, field
-from pathlib import Path
-import tempfile
-from datetime import datetime
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format=
-    '%(asctime)s - %(name)s - %(levelname)s - [%(pathname)s:%(lineno)d] - %(message)s'
-)
-logger = logging.getLogger(__name__)
 
 
-@dataclass
+@dataclass(slots=True)
 class LanguageConfig:
     """Configuration for language-specific analysis."""
     name: str
@@ -59,7 +43,7 @@ class LanguageConfig:
     })
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityMetrics:
     """Security-related metrics"""
     vulnerabilities: List[Dict] = field(default_factory=list)
@@ -70,7 +54,7 @@ class SecurityMetrics:
     data_encryption: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class PerformanceMetrics:
     """Performance-related metrics"""
     memory_usage: Optional[float] = None
@@ -81,17 +65,72 @@ class PerformanceMetrics:
     resource_leaks: List[str] = field(default_factory=list)
 
 
-import subprocess
-import json
-from functools import lru_cache
-
-
 class FileAnalyzer:
     """Analyzer for source code files"""
 
+    # Feature patterns, all matched case-insensitively in a single scan
+    SECURITY_PATTERNS = {
+        # The string body is consumed up to the first %s only, so a long
+        # unterminated literal is scanned once instead of once per %s
+        'sql_injection': r'(execute|raw)\s*\(\s*[\'"][^\'%]*(?:%(?!s)[^\'%]*)*%s[^\']*[\'"]\s*\)',
+        'xss': r'innerHTML\s*=|document\.write\(',
+        'command_injection': r'(subprocess\.call|os\.system|eval|exec)\(',
+    }
+    # Fixed needles are cheaper as plain substring checks than as regexes
+    LITERAL_SECURITY_PATTERNS = {
+        'path_traversal': '../',
+    }
+    PERFORMANCE_PATTERNS = {
+        'authentication': r'authenticate|login|authorize',
+        'input_validation': r'validate|sanitize|escape',
+        'caching': r'cache|memoize|lru_cache',
+        'async_operations': r'async|await|promise|concurrent',
+    }
+    RESOURCE_PATTERNS = {
+        'file_handles': r'open\([^)]+\)',
+        'database_connections': r'(connect|cursor)\(',
+        'thread_creation': r'(thread|process)\(',
+    }
+    CLEANUP_PATTERNS = {
+        'close': r'close',
+        'dispose': r'dispose',
+    }
+    # Cleanup call expected for each resource type
+    RESOURCE_CLEANUP = {
+        'file_handles': 'close',
+        'database_connections': 'dispose',
+        'thread_creation': 'dispose',
+    }
+    # Each alternative is a lookahead so overlapping features are all seen
+    FEATURE_SCAN = re.compile('|'.join(
+        f'(?=(?P<{name}>{pattern}))'
+        for patterns in (SECURITY_PATTERNS, PERFORMANCE_PATTERNS,
+                         RESOURCE_PATTERNS, CLEANUP_PATTERNS)
+        for name, pattern in patterns.items()
+    ), re.IGNORECASE)
+
     def __init__(self, content: str, language: str):
         self.content = content
         self.language = language
+        self._feature_cache = None
+
+    def _detect_features(self, content: str) -> Set[str]:
+        """Return the names of all feature patterns present in content"""
+        if self._feature_cache is not None and self._feature_cache[0] is content:
+            return self._feature_cache[1]
+
+        found = set()
+        total = len(self.FEATURE_SCAN.groupindex)
+        for match in self.FEATURE_SCAN.finditer(content):
+            found.add(match.lastgroup)
+            if len(found) == total:
+                break
+
+        found.update(name for name, needle in self.LITERAL_SECURITY_PATTERNS.items()
+                     if needle in content)
+
+        self._feature_cache = (content, found)
+        return found
 
     def analyze(self) -> Dict:
         """Analyze the source code file"""
@@ -107,18 +146,11 @@ class FileAnalyzer:
         """Analyze security aspects of the code"""
         security_metrics = SecurityMetrics()
 
-        # Check for common security patterns
-        patterns = {
-            'sql_injection':
-            r'(?i)(execute|raw)\s*\(\s*[\'"][^\']*\%s[^\']*[\'"]\s*\)',
-            'xss': r'(?i)innerHTML\s*=|document\.write\(',
-            'command_injection':
-            r'(?i)(subprocess\.call|os\.system|eval|exec)\(',
-            'path_traversal': r'(?i)\.\./',
-        }
+        features = self._detect_features(content)
 
-        for vuln_type, pattern in patterns.items():
-            if re.search(pattern, content):
+        # Check for common security patterns
+        for vuln_type in (*self.SECURITY_PATTERNS, *self.LITERAL_SECURITY_PATTERNS):
+            if vuln_type in features:
                 security_metrics.vulnerabilities.append({
                     'type':
                     vuln_type,
@@ -129,12 +161,10 @@ class FileAnalyzer:
                 })
 
         # Check for authentication patterns
-        security_metrics.authentication_checks = bool(
-            re.search(r'(?i)(authenticate|login|authorize)', content))
+        security_metrics.authentication_checks = 'authentication' in features
 
         # Check for input validation
-        security_metrics.input_validation = bool(
-            re.search(r'(?i)(validate|sanitize|escape)', content))
+        security_metrics.input_validation = 'input_validation' in features
 
         return security_metrics
 
@@ -144,26 +174,21 @@ class FileAnalyzer:
         """Analyze performance aspects of the code"""
         performance_metrics = PerformanceMetrics()
 
+        features = self._detect_features(content)
+
         # Check for common performance patterns
-        if re.search(r'(?i)(cache|memoize|lru_cache)', content):
+        if 'caching' in features:
             performance_metrics.caching_used = True
 
         # Check for async operations
-        if re.search(r'(?i)(async|await|promise|concurrent)', content):
+        if 'async_operations' in features:
             performance_metrics.async_operations = True
 
         # Check for potential resource leaks
-        resource_patterns = {
-            'file_handles': r'(?i)open\([^)]+\)',
-            'database_connections': r'(?i)(connect|cursor)\(',
-            'thread_creation': r'(?i)(thread|process)\(',
-        }
-
-        for resource_type, pattern in resource_patterns.items():
-            if re.search(pattern, content):
+        for resource_type in self.RESOURCE_PATTERNS:
+            if resource_type in features:
                 # Check if there's proper cleanup
-                cleanup_pattern = resource_type == 'file_handles' and 'close()' or 'dispose()'
-                if not re.search(f'(?i){cleanup_pattern}', content):
+                if self.RESOURCE_CLEANUP[resource_type] not in features:
                     performance_metrics.resource_leaks.append(
                         f'Potential unclosed {resource_type}')
 
@@ -172,6 +197,19 @@ class FileAnalyzer:
 
 import lizard
 
+# ES module, CommonJS and dynamic imports; exactly one group captures per match
+JS_IMPORT_PATTERN = re.compile(
+    r'import\s+.*\s+from\s+[\'"]([^\'"]+)[\'"]'
+    r'|require\([\'"]([^\'"]+)[\'"]\)'
+    r'|import\([\'"]([^\'"]+)[\'"]\)'
+)
+
+# @version tag in Python docstrings and JSDoc comments
+VERSION_TAG_PATTERN = re.compile(r'@version\s+(\S+)')
+
+# Docstring tags marking an API as changed incompatibly or on its way out
+BREAKING_INDICATORS = ('@breaking', '@deprecated')
+
 # Define language configurations
 LANGUAGE_CONFIGS = {
     'python': LanguageConfig(
@@ -230,10 +268,17 @@ LANGUAGE_CONFIGS = {
     )
 }
 
+# Extension to configuration lookup, built once so each file is resolved in one step
+LANGUAGE_CONFIG_BY_EXTENSION = {
+    ext: config
+    for config in LANGUAGE_CONFIGS.values()
+    for ext in config.extensions
+}
+
 # Already defined SecurityMetrics and PerformanceMetrics above
 
 
-@dataclass
+@dataclass(slots=True)
 class EnhancedComplexityMetrics:
     """Enhanced complexity metrics"""
     cyclomatic_complexity: int = 0
@@ -244,15 +289,6 @@ class EnhancedComplexityMetrics:
     documentation_coverage: float = 0.0
 
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format=
-    '%(asctime)s - %(name)s - %(levelname)s - [%(pathname)s:%(lineno)d] - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
-
 class CodeSmell(TypedDict):
     """Code smell information"""
     type: str
@@ -268,7 +304,7 @@ class APIStabilityInfo(TypedDict):
     version_info: Optional[str]
 
 
-@dataclass
+@dataclass(slots=True)
 class ComplexityMetrics:
     """Complexity metrics for code analysis"""
     cyclomatic_complexity: int = 0
@@ -285,7 +321,7 @@ class ComplexityMetrics:
                                       other.maintainability_index) / 2
 
 
-@dataclass
+@dataclass(slots=True)
 class AnalysisResult:
     """Result of code structure analysis"""
     structures: List[Dict]
@@ -299,9 +335,14 @@ class AnalysisResult:
 class CodeStructureService:
     """Enhanced service for analyzing code structure with multi-language support"""
 
+    # Analysis results kept per instance; the service is shared across requests
+    CACHE_SIZE = 256
+    CACHE_TTL_SECONDS = 3600
+
     def __init__(self):
         """Initialize the service with enhanced capabilities"""
-        self.metrics_cache = {}  # Cache for analysis results
+        self.metrics_cache = OrderedDict()  # Cache for analysis results
+        self._cache_lock = threading.Lock()
         self.language_stats = {}  # Store language detection results
         self.dependency_graph = {}  # Store dependency relationships
         self.api_stability_info = {}  # Store API stability information
@@ -314,21 +355,28 @@ class CodeStructureService:
         return f"{filename}:{content_hash}"
 
     def _store_result(self, cache_key: str, result: AnalysisResult) -> None:
-        """Store analysis result in cache"""
-        self.metrics_cache[cache_key] = {
-            'result': result,
-            'timestamp': datetime.utcnow(),
-            'metrics': {
-                'documentation_coverage':
-                self._calculate_doc_coverage(result),
-                'dependency_count':
-                len(result.imports),
-                'complexity_score':
-                result.total_complexity.cyclomatic_complexity,
-                'maintainability_index':
-                result.total_complexity.maintainability_index
+        """Store analysis result in cache, evicting the least recently used entry"""
+        with self._cache_lock:
+            self.metrics_cache[cache_key] = {
+                'result': result,
+                'timestamp': datetime.utcnow()
             }
-        }
+            self.metrics_cache.move_to_end(cache_key)
+            if len(self.metrics_cache) > self.CACHE_SIZE:
+                self.metrics_cache.popitem(last=False)
+
+    def _get_cached_result(self, cache_key: str) -> Optional[AnalysisResult]:
+        """Return a fresh cached result, dropping it if it has expired"""
+        with self._cache_lock:
+            cached = self.metrics_cache.get(cache_key)
+            if cached is None:
+                return None
+            age = (datetime.utcnow() - cached['timestamp']).total_seconds()
+            if age >= self.CACHE_TTL_SECONDS:
+                del self.metrics_cache[cache_key]
+                return None
+            self.metrics_cache.move_to_end(cache_key)
+            return cached['result']
 
     def _init_language_analyzers(self):
         """Initialize language-specific analyzers"""
@@ -367,27 +415,16 @@ class CodeStructureService:
             logger.error(f"Error calculating nesting depth: {str(e)}")
             return 0
 
-    def _empty_result(self) -> AnalysisResult:
-        """Return empty analysis result."""
-        return AnalysisResult(structures=[],
-                              imports=[],
-                              total_complexity=ComplexityMetrics(),
-                              security_metrics=SecurityMetrics(),
-                              performance_metrics=PerformanceMetrics(),
-                              documentation_metrics=None)
-
     def analyze_code(self, content: str, filename: str) -> AnalysisResult:
         """Analyze code structure with enhanced multi-language support and error handling"""
         logger.info(f"Starting analysis for file: {filename}")
 
         # Check cache first
         cache_key = self._get_cache_key(content, filename)
-        if cache_key in self.metrics_cache:
-            cached = self.metrics_cache[cache_key]
-            if (datetime.utcnow() - cached['timestamp']
-                ).total_seconds() < 3600:  # 1 hour cache
-                logger.info(f"Using cached analysis for {filename}")
-                return cached['result']
+        cached_result = self._get_cached_result(cache_key)
+        if cached_result is not None:
+            logger.info(f"Using cached analysis for {filename}")
+            return cached_result
 
         try:
             # Input validation
@@ -402,12 +439,7 @@ class CodeStructureService:
 
             # Get language configuration
             ext = Path(filename).suffix.lower()
-            language_config = None
-
-            for lang_config in LANGUAGE_CONFIGS.values():
-                if ext in lang_config.extensions:
-                    language_config = lang_config
-                    break
+            language_config = LANGUAGE_CONFIG_BY_EXTENSION.get(ext)
 
             if not language_config:
                 logger.warning(f"Unsupported file type: {filename}")
@@ -467,37 +499,6 @@ class CodeStructureService:
             logger.error(f"Error during analysis: {str(e)}")
             return self._empty_result()
 
-    def _analyze_documentation(self, content: str, filename: str) -> Dict[str, Any]:
-        """Analyze documentation quality and coverage with support for multiple doc styles."""
-        try:
-            if not hasattr(self, 'doc_analyzer'):
-                from services.code_analysis.analyzers.documentation_analyzer import DocumentationAnalyzer
-                self.doc_analyzer = DocumentationAnalyzer()
-                self.doc_analyzer.initialize()
-                logger.info("Documentation analyzer initialized")
-
-            # Execute documentation analysis
-            doc_metrics = self.doc_analyzer.analyze_documentation(content, filename)
-            if not doc_metrics:
-                return self._empty_doc_info('No documentation found')
-
-            # Convert to standardized format
-            result = {
-                'module_doc': doc_metrics.module_doc,
-                'classes': doc_metrics.classes,
-                'functions': doc_metrics.functions,
-                'coverage': doc_metrics.coverage,
-                'quality_score': doc_metrics.quality_score,
-                'error': doc_metrics.error
-            }
-
-            logger.info(f"Documentation analysis completed for {filename}")
-            return result
-
-        except Exception as e:
-            logger.error(f"Documentation analysis failed: {str(e)}")
-            return self._empty_doc_info(str(e))
-
     def _analyze_documentation(self, content: str, filename: str) -> Dict[str, Any]:
         """Analyze documentation quality and coverage with support for multiple doc styles."""
         try:
@@ -533,55 +534,6 @@ class CodeStructureService:
             'error': error_message if error_message else 'No documentation available'
         }
 
-    def _analyze_javascript(self, content: str, filename: str) -> AnalysisResult:
-        """Analyze JavaScript/TypeScript code structure."""
-        try:
-            # Basic structure analysis
-            structures = []
-            imports = []
-
-            # Parse imports using regex
-            import_patterns = [
-                r'import\s+.*\s+from\s+[\'"]([^\'"]+)[\'"]',
-                r'require\([\'"]([^\'"]+)[\'"]\)',
-                r'import\([\'"]([^\'"]+)[\'"]\)'
-            ]
-
-            for pattern in import_patterns:
-                imports.extend(re.findall(pattern, content))
-
-            # Calculate complexity metrics
-            total_complexity = ComplexityMetrics(
-                cyclomatic_complexity=metrics.get('CCN', 0),
-                cognitive_complexity=len(re.findall(r'\b(if|while|for|switch)\b', content)),
-                nesting_depth=self._calculate_nesting_depth(content),
-                maintainability_index=100.0  # Default value
-            )
-
-            # Add documentation analysis
-            doc_analysis = self._analyze_documentation(content, filename)
-
-            return AnalysisResult(
-                structures=structures,
-                imports=list(set(imports)),
-                total_complexity=total_complexity,
-                documentation_metrics=doc_analysis
-            )
-
-        except Exception as e:
-            logger.error(f"Error analyzing JavaScript file {filename}: {str(e)}")
-            return self._empty_result()
-            
-            
-
-    
-
-    
-
-    
-
-    
-
     def _analyze_generic(self, content: str, filename: str, metrics: Dict) -> AnalysisResult:
         """Generic analysis for unsupported languages"""
         structures = []
@@ -658,17 +610,10 @@ class CodeStructureService:
         try:
             # Basic structure analysis
             structures = []
-            imports = []
-
-            # Parse imports using regex
-            import_patterns = [
-                r'import\s+.*\s+from\s+[\'"]([^\'"]+)[\'"]',
-                r'require\([\'"]([^\'"]+)[\'"]\)',
-                r'import\([\'"]([^\'"]+)[\'"]\)'
-            ]
 
-            for pattern in import_patterns:
-                imports.extend(re.findall(pattern, content))
+            # Parse imports using regex, keeping each module once
+            imports = {group for groups in JS_IMPORT_PATTERN.findall(content)
+                       for group in groups if group}
 
             # Calculate complexity metrics
             total_complexity = ComplexityMetrics(
@@ -683,7 +628,7 @@ class CodeStructureService:
 
             return AnalysisResult(
                 structures=structures,
-                imports=list(set(imports)),
+                imports=list(imports),
                 total_complexity=total_complexity,
                 documentation_metrics=doc_analysis
             )
@@ -728,19 +673,12 @@ class CodeStructureService:
     def _extract_imports(self, node: Union[ast.Import,
                                            ast.ImportFrom]) -> List[str]:
         """Extract import statements"""
-        imports = []
-        try:
-            if isinstance(node, ast.Import):
-                for name in node.names:
-                    imports.append(name.name)
-            elif isinstance(node, ast.ImportFrom):
-                module = node.module if node.module else ''
-                for name in node.names:
-                    imports.append(
-                        f"{module}.{name.name}" if module else name.name)
-        except Exception as e:
-            logger.error(f"Error extracting imports: {str(e)}")
-        return imports
+        if isinstance(node, ast.Import):
+            return [name.name for name in node.names]
+        module = node.module
+        if module:
+            return [f"{module}.{name.name}" for name in node.names]
+        return [name.name for name in node.names]
 
     def _get_attribute_chain(self, node: ast.Attribute) -> str:
         """Get the full chain of attribute access"""
@@ -800,15 +738,15 @@ class CodeStructureService:
             # Check docstring for version information
             docstring = ast.get_docstring(node)
             if docstring:
-                version_match = re.search(r'@version\s+(\S+)', docstring)
-                if version_match:
-                    version_info = version_match.group(1)
+                if '@version' in docstring:
+                    version_match = VERSION_TAG_PATTERN.search(docstring)
+                    if version_match:
+                        version_info = version_match.group(1)
 
                 # Check for breaking changes indicators
-                breaking_indicators = ['@breaking', '@deprecated']
                 has_breaking_changes = any(
                     indicator in docstring
-                    for indicator in breaking_indicators)
+                    for indicator in BREAKING_INDICATORS)
 
             return {
                 'is_public': is_public,
@@ -867,16 +805,11 @@ class CodeStructureService:
 
     def _count_lines(self, node: Union[ast.ClassDef, ast.FunctionDef]) -> int:
         """Count lines of code in Python node"""
-        try:
-            start_line = node.lineno
-            end_line = 0
-            for child in ast.walk(node):
-                if hasattr(child, 'lineno'):
-                    end_line = max(end_line, child.lineno)
-            return max(1, end_line - start_line + 1)
-        except Exception as e:
-            logger.error(f"Error counting lines: {str(e)}")
-            return 1
+        end_line = 0
+        for child in ast.walk(node):
+            if hasattr(child, 'lineno'):
+                end_line = max(end_line, child.lineno)
+        return max(1, end_line - node.lineno + 1)
 
     def _empty_result(self) -> AnalysisResult:
         """Create an empty analysis result"""
@@ -990,8 +923,7 @@ class CodeStructureService:
             for comment in node.leadingComments:
                 if comment.type == 'Block':
                     if '@version' in comment.value:
-                        version_match = re.search(r'@version\s+(\S+)',
-                                                  comment.value)
+                        version_match = VERSION_TAG_PATTERN.search(comment.value)
                         if version_match:
                             version_info = version_match.group(1)
                     if '@deprecated' in comment.value or '@breaking' in comment.value:
@@ -1,9 +1,12 @@
 import subprocess
 import json
 import os
+import re
 import logging
 from typing import Dict, List, Optional
 import tempfile
+from bisect import bisect_left
+from collections import defaultdict
 
 # Configure logging
 logging.basicConfig(
@@ -12,7 +15,80 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Separator between __all__ entries, consuming the whitespace around each comma
+_COMMA_SPLIT_RE = re.compile(r'\s*,\s*')
+
 class DependencyService:
+    # File extensions to analyze
+    CODE_EXTENSIONS = {
+        # JavaScript/TypeScript
+        '.js': 'JavaScript',
+        '.jsx': 'JavaScript React',
+        '.ts': 'TypeScript',
+        '.tsx': 'TypeScript React',
+        # Python
+        '.py': 'Python',
+        # Other languages
+        '.java': 'Java',
+        '.go': 'Go',
+        '.rb': 'Ruby',
+        '.php': 'PHP'
+    }
+    
+    # Skip patterns for configuration and test files
+    SKIP_PATTERNS = (
+        '.test.', '.spec.', '.config.',  # Test and config files
+        'package.json', 'package-lock.json',  # Package files
+        '.replit', 'poetry.lock', 'pyproject.toml',  # Project config
+        '.git', '.env', '.vscode',  # Hidden/IDE files
+        'README', 'LICENSE', '.md', '.txt'  # Documentation
+    )
+    # All skip patterns as one alternation, so a filename is scanned once
+    SKIP_PATTERN_RE = re.compile('|'.join(map(re.escape, SKIP_PATTERNS)))
+    
+    # Custom dependency-cruiser configuration
+    DEPENDENCY_CRUISER_CONFIG = {
+        "forbidden": [
+            {
+                "name": "no-circular",
+                "severity": "error",
+                "from": {},
+                "to": {
+                    "circular": True
+                }
+            }
+        ],
+        "options": {
+            "doNotFollow": {
+                "path": "node_modules",
+                "dependencyTypes": [
+                    "npm",
+                    "npm-dev",
+                    "npm-optional",
+                    "npm-peer",
+                    "npm-bundled"
+                ]
+            },
+            "exclude": "\\.(spec|test|config)\\.(js|ts|jsx|tsx)$|\\.(replit|json|md|txt|svg)$",
+            "maxDepth": 6,
+            "includeOnly": "\\.(js|jsx|ts|tsx|py)$",
+            "moduleSystems": ["amd", "cjs", "es6", "tsd"],
+            "tsConfig": None,
+            "tsPreCompilationDeps": "true",
+            "preserveSymlinks": "false",
+            "webpackConfig": None,
+            "enhancedResolveOptions": {
+                "exportsFields": ["exports"],
+                "conditionNames": ["import", "require", "node", "default"],
+                "extensions": [".js", ".jsx", ".ts", ".tsx", ".py"]
+            },
+            "cache": {
+                "enabled": "true",
+                "strategy": "metadata"
+            }
+        }
+    }
+    
     def __init__(self):
         """Initialize dependency analysis service"""
         self.temp_dir: str = ""
@@ -80,31 +156,6 @@ class DependencyService:
     
     def _write_files_to_temp(self, files: List[Dict]) -> None:
         """Write PR files to temporary directory with filtering"""
-        # File extensions to analyze
-        CODE_EXTENSIONS = {
-            # JavaScript/TypeScript
-            '.js': 'JavaScript',
-            '.jsx': 'JavaScript React',
-            '.ts': 'TypeScript',
-            '.tsx': 'TypeScript React',
-            # Python
-            '.py': 'Python',
-            # Other languages
-            '.java': 'Java',
-            '.go': 'Go',
-            '.rb': 'Ruby',
-            '.php': 'PHP'
-        }
-        
-        # Skip patterns for configuration and test files
-        SKIP_PATTERNS = [
-            '.test.', '.spec.', '.config.',  # Test and config files
-            'package.json', 'package-lock.json',  # Package files
-            '.replit', 'poetry.lock', 'pyproject.toml',  # Project config
-            '.git', '.env', '.vscode',  # Hidden/IDE files
-            'README', 'LICENSE', '.md', '.txt'  # Documentation
-        ]
-        
         for file in files:
             filename = file.get('filename', '')
             if not filename or not file.get('patch'):
@@ -112,81 +163,37 @@ class DependencyService:
                 
             # Get file extension and validate
             ext = os.path.splitext(filename)[1].lower()
-            if ext not in CODE_EXTENSIONS:
-                logger.debug(f"Skipping non-code file: {filename} (unsupported extension)")
+            if ext not in self.CODE_EXTENSIONS:
+                logger.debug("Skipping non-code file: %s (unsupported extension)", filename)
                 continue
                 
             # Skip files matching skip patterns
-            if any(pattern in filename.lower() for pattern in SKIP_PATTERNS):
-                logger.debug(f"Skipping file: {filename} (matches skip pattern)")
+            if self.SKIP_PATTERN_RE.search(filename.lower()):
+                logger.debug("Skipping file: %s (matches skip pattern)", filename)
                 continue
                 
-            logger.info(f"Processing {CODE_EXTENSIONS[ext]} file: {filename}")
+            logger.info(f"Processing {self.CODE_EXTENSIONS[ext]} file: {filename}")
             
             file_path = os.path.join(str(self.temp_dir), filename)
             os.makedirs(os.path.dirname(file_path), exist_ok=True)
             
             try:
-                logger.info(f"Processing file for analysis: {filename}")
                 with open(file_path, 'w') as f:
                     f.write(file['patch'])
             except Exception as e:
                 logger.error(f"Failed to write file {filename}: {str(e)}")
                 continue
             
-            logger.debug(f"Successfully wrote {filename} to temp directory")
+            logger.debug("Successfully wrote %s to temp directory", filename)
     
     def _run_dependency_cruiser(self) -> Optional[Dict]:
         """Run dependency-cruiser analysis with improved error handling"""
         try:
             logger.info("Configuring dependency-cruiser analysis")
-            # Custom dependency-cruiser configuration
-            config = {
-                "forbidden": [
-                    {
-                        "name": "no-circular",
-                        "severity": "error",
-                        "from": {},
-                        "to": {
-                            "circular": True
-                        }
-                    }
-                ],
-                "options": {
-                    "doNotFollow": {
-                        "path": "node_modules",
-                        "dependencyTypes": [
-                            "npm",
-                            "npm-dev",
-                            "npm-optional",
-                            "npm-peer",
-                            "npm-bundled"
-                        ]
-                    },
-                    "exclude": "\\.(spec|test|config)\\.(js|ts|jsx|tsx)$|\\.(replit|json|md|txt|svg)$",
-                    "maxDepth": 6,
-                    "includeOnly": "\\.(js|jsx|ts|tsx|py)$",
-                    "moduleSystems": ["amd", "cjs", "es6", "tsd"],
-                    "tsConfig": None,
-                    "tsPreCompilationDeps": "true",
-                    "preserveSymlinks": "false",
-                    "webpackConfig": None,
-                    "enhancedResolveOptions": {
-                        "exportsFields": ["exports"],
-                        "conditionNames": ["import", "require", "node", "default"],
-                        "extensions": [".js", ".jsx", ".ts", ".tsx", ".py"]
-                    },
-                    "cache": {
-                        "enabled": "true",
-                        "strategy": "metadata"
-                    }
-                }
-            }
-            
             config_path = os.path.join(str(self.temp_dir), '.dependency-cruiser.json')
             try:
                 with open(config_path, 'w') as f:
-                    json.dump(config, f, indent=2)
+                    json.dump(self.DEPENDENCY_CRUISER_CONFIG, f, indent=2)
                 logger.info("Successfully wrote dependency-cruiser configuration")
             except Exception as e:
                 logger.error(f"Failed to write dependency-cruiser configuration: {str(e)}")
@@ -274,23 +281,29 @@ class DependencyService:
                                     'depends_on': dep['resolved']
                                 })
                     
-                    # Perform code structure analysis
+                    # Perform code structure analysis, splitting the source once for all helpers
+                    lines = source.splitlines()
                     structure_analysis[source] = {
-                        'exports': self._analyze_exports(module),
-                        'functions': self._analyze_function_length(module),
-                        'duplication': self._find_code_duplication(module),
-                        'comment_ratio': self._calculate_comment_ratio(module)
+                        'exports': self._analyze_exports(source, lines),
+                        'functions': self._analyze_function_length(lines),
+                        'duplication': self._find_code_duplication(lines),
+                        'comment_ratio': self._calculate_comment_ratio(lines)
                     }
         
         # Process madge results for circular dependencies
         if madge_result:
+            # Membership sets built once, rather than list scans per dependency edge
+            dependency_sets = {module: set(deps) for module, deps in madge_result.items()}
+            reported_pairs = set()
             for source, deps in madge_result.items():
-                if source in deps:  # Self-dependency
+                if source in dependency_sets[source]:  # Self-dependency
                     circular_dependencies.append([source])
                 for dep in deps:
-                    if dep in madge_result and source in madge_result[dep]:
+                    if dep in dependency_sets and source in dependency_sets[dep]:
                         # Found circular dependency
-                        if [source, dep] not in circular_dependencies and [dep, source] not in circular_dependencies:
+                        if (source, dep) not in reported_pairs:
+                            reported_pairs.add((source, dep))
+                            reported_pairs.add((dep, source))
                             circular_dependencies.append([source, dep])
         
         # Combine results
@@ -303,46 +316,52 @@ class DependencyService:
         
         return result
 
-    def _analyze_exports(self, module: Dict) -> List[str]:
+    def _analyze_exports(self, source: str, lines: List[str]) -> List[str]:
         """Analyze module exports"""
         exports = []
-        if not module.get('source'):
+        if not lines:
             return exports
-            
-        content = module.get('source', '')
         
-        # Find exports through __all__
-        for line in content.splitlines():
-            if '__all__' in line and '=' in line:
+        # One pass collects both __all__ entries and public definitions
+        check_all = '__all__' in source
+        check_defs = 'def ' in source or 'class ' in source
+        if not (check_all or check_defs):
+            return exports
+
+        declared = []
+        for line in lines:
+            if check_all and '__all__' in line and '=' in line:
                 try:
                     # Extract list items from __all__ definition
                     items = line.split('=')[1].strip()
                     if items.startswith('[') and items.endswith(']'):
-                        items = items[1:-1]  # Remove brackets
-                        exports.extend([item.strip().strip("'").strip('"') 
-                                     for item in items.split(',') if item.strip()])
+                        items = items[1:-1].strip()  # Remove brackets
+                        exports.extend(item.strip("'").strip('"')
+                                       for item in _COMMA_SPLIT_RE.split(items) if item)
                 except Exception as e:
-                    logger.error(f"Error parsing __all__ in {module.get('source', '')}: {str(e)}")
-        
-        # Find other exports (public functions and classes)
-        for line in content.splitlines():
-            if line.strip().startswith(('def ', 'class ')) and not line.strip().startswith('_'):
-                name = line.split()[1].split('(')[0]
-                if name not in exports:
-                    exports.append(name)
+                    logger.error(f"Error parsing __all__ in {source}: {str(e)}")
+            if check_defs and line.strip().startswith(('def ', 'class ')):
+                declared.append(line.split()[1].split('(')[0])
+
+        # Public definitions follow __all__ entries, skipping names already listed
+        seen = set(exports)
+        for name in declared:
+            if name not in seen:
+                seen.add(name)
+                exports.append(name)
         
         return exports
 
-    def _analyze_function_length(self, module: Dict) -> Dict[str, int]:
+    def _analyze_function_length(self, lines: List[str]) -> Dict[str, int]:
         """Analyze function lengths in the module"""
         functions = {}
-        if not module.get('source'):
+        if not lines:
             return functions
 
         current_function = None
         current_length = 0
         
-        for line in module.get('source', '').splitlines():
+        for line in lines:
             if line.strip().startswith('def '):
                 if current_function:
                     functions[current_function] = current_length
@@ -360,93 +379,58 @@ class DependencyService:
             
         return functions
 
-    def _find_code_duplication(self, module: Dict) -> Dict:
+    def _find_code_duplication(self, lines: List[str]) -> Dict:
         """Find potential code duplication"""
         duplication = {
             'duplicate_blocks': [],
             'similarity_score': 0.0
         }
         
-        if not module.get('source'):
+        if not lines:
             return duplication
         
-        content = module.get('source', '')
-        lines = content.splitlines()
         block_size = 6  # Minimum block size to consider
         
-        for i in range(len(lines) - block_size):
-            block1 = '\n'.join(lines[i:i + block_size])
-            for j in range(i + block_size, len(lines) - block_size):
-                block2 = '\n'.join(lines[j:j + block_size])
-                if block1 == block2:
-                    duplication['duplicate_blocks'].append({
-                        'start_line1': i + 1,
-                        'end_line1': i + block_size,
-                        'start_line2': j + 1,
-                        'end_line2': j + block_size
-                    })
+        # Two non-overlapping blocks need more than twice the block size
+        if len(lines) <= 2 * block_size:
+            return duplication
+        
+        # Group block start positions by block content, so each block is
+        # compared by hashing once instead of against every later block
+        block_count = len(lines) - block_size
+        starts_by_block = defaultdict(list)
+        for i in range(block_count):
+            starts_by_block[tuple(lines[i:i + block_size])].append(i)
+        
+        for i in range(block_count):
+            starts = starts_by_block[tuple(lines[i:i + block_size])]
+            for j in starts[bisect_left(starts, i + block_size):]:
+                duplication['duplicate_blocks'].append({
+                    'start_line1': i + 1,
+                    'end_line1': i + block_size,
+                    'start_line2': j + 1,
+                    'end_line2': j + block_size
+                })
         
         if duplication['duplicate_blocks']:
             total_duplicated = sum(block_size for _ in duplication['duplicate_blocks'])
             duplication['similarity_score'] = total_duplicated / len(lines)
         
-    def _calculate_comment_ratio(self, module: Dict) -> float:
+        return duplication
+
+    def _calculate_comment_ratio(self, lines: List[str]) -> float:
         """Calculate the ratio of comments to code"""
-        if not module.get('source'):
+        if not lines:
             return 0.0
         
-        content = module.get('source', '')
-        lines = content.splitlines()
-        
+        # Count in one pass, stripping each line once
         comment_lines = 0
         code_lines = 0
-        in_multiline = False
-        
         for line in lines:
             stripped = line.strip()
-            
-            # Skip empty lines
-            if not stripped:
-                continue
-                
-            # Handle multiline comments
-            if stripped.startswith('"""') or stripped.startswith("'''"):
-                if in_multiline:
-                    in_multiline = False
-                else:
-                    in_multiline = True
+            if stripped.startswith(('#', '"""', "'''")):
                 comment_lines += 1
-                continue
-                
-            # Count comment and code lines
-            if in_multiline:
-                comment_lines += 1
-            elif stripped.startswith('#'):
-                comment_lines += 1
-            else:
+            elif stripped:
                 code_lines += 1
         
-        total_lines = comment_lines + code_lines
-        return round(comment_lines / total_lines, 2) if total_lines > 0 else 0.0
-        return duplication
-
-    def _calculate_comment_ratio(self, module: Dict) -> float:
-        """Calculate the ratio of comments to code"""
-        if not module.get('source'):
-            return 0.0
-        
-        content = module.get('source', '')
-        lines = content.splitlines()
-        
-        comment_lines = len([line for line in lines 
-                           if line.strip().startswith('#') or 
-                           line.strip().startswith('"""') or 
-                           line.strip().startswith("'''")]) 
-        
-        code_lines = len([line for line in lines 
-                         if line.strip() and 
-                         not line.strip().startswith('#') and 
-                         not line.strip().startswith('"""') and 
-                         not line.strip().startswith("'''")])
-        
         return comment_lines / max(1, code_lines)
@@ -1,6 +1,7 @@
 from github import Github
 from github.GithubException import GithubException
 from typing import Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
 # Configure logging
@@ -11,6 +12,9 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class GitHubService:
+    # Largest page GitHub allows, so PR files and comments take fewer API calls
+    PAGE_SIZE = 100
+
     def __init__(self, token: str):
         """Initialize GitHub service with optional token validation"""
         if not token:
@@ -20,7 +24,7 @@ class GitHubService:
             return
             
         try:
-            self.github = Github(token)
+            self.github = Github(token, per_page=self.PAGE_SIZE)
             self.token_valid = False  # Will be set to True after successful validation
             # Perform basic validation without requiring write access
             self._basic_validation()
@@ -96,14 +100,27 @@ class GitHubService:
             return f"Token lacks required scopes: {error_message}"
         return "Token lacks required permissions"
 
-    def fetch_pr_data(self, pr_details: Dict) -> Dict:
+    def _get_pull(self, pr_details: Dict):
+        """Get the pull request without a separate round trip for the repository
+
+        This is the only place a pull request is resolved. Every fetch and
+        post method takes the result as an optional ``pr`` argument, so a
+        review resolves it once and passes it through.
+
+        The repository is created lazily, so only the pull request lookup
+        counts against the rate limit; a missing repository still surfaces
+        as a 404 from that lookup.
+        """
+        repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}", lazy=True)
+        return repo.get_pull(pr_details['number'])
+
+    def fetch_pr_data(self, pr_details: Dict, pr=None) -> Dict:
         """Fetches PR data using GitHub API with enhanced error handling"""
         if not self.github or not self.token_valid:
             raise ValueError("GitHub token not configured or invalid")
             
         try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
+            pr = pr or self._get_pull(pr_details)
             
             return {
                 'title': pr.title,
@@ -122,56 +139,15 @@ class GitHubService:
             else:
                 raise ValueError(f"Failed to fetch PR data: {str(e)}")
     
-    async def fetch_pr_files(self, pr_details: Dict) -> List[Dict]:
+    async def fetch_pr_files(self, pr_details: Dict, pr=None) -> List[Dict]:
         """Fetches files changed in the PR with enhanced error handling"""
-        if not self.github or not self.token_valid:
-            raise ValueError("GitHub token not configured or invalid")
-            
-        try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
-            
-            files_data = []
-            for f in pr.get_files():
-                files_data.append({
-                    'filename': f.filename,
-                    'status': f.status,
-                    'additions': f.additions,
-                    'deletions': f.deletions,
-                    'changes': f.changes,
-                    'patch': f.patch if f.patch else ''
-                })
-            return files_data
-        except GithubException as e:
-            if e.status == 403:
-                raise ValueError("Access denied. Please check repository permissions for file access")
-            else:
-                raise ValueError(f"Failed to fetch PR files: {str(e)}")
+        return self.fetch_pr_files_sync(pr_details, pr)
     
-    async def fetch_pr_comments(self, pr_details: Dict) -> List[Dict]:
+    async def fetch_pr_comments(self, pr_details: Dict, pr=None) -> List[Dict]:
         """Fetches PR comments with enhanced error handling"""
-        if not self.github or not self.token_valid:
-            raise ValueError("GitHub token not configured or invalid")
+        return self.fetch_pr_comments_sync(pr_details, pr)
             
-        try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
-            
-            comments_data = []
-            for comment in pr.get_comments():
-                comments_data.append({
-                    'user': comment.user.login,
-                    'body': comment.body,
-                    'created_at': comment.created_at
-                })
-            return comments_data
-        except GithubException as e:
-            if e.status == 403:
-                raise ValueError("Access denied. Please check permissions for viewing comments")
-            else:
-                raise ValueError(f"Failed to fetch PR comments: {str(e)}")
-            
-    def post_pr_comment(self, pr_details: Dict, comment_text: str) -> Dict:
+    def post_pr_comment(self, pr_details: Dict, comment_text: str, pr=None) -> Dict:
         """Posts a comment on the PR with enhanced error handling"""
         if not self.github or not self.token_valid:
             raise ValueError("GitHub token not configured or invalid")
@@ -180,8 +156,7 @@ class GitHubService:
         self._verify_write_access(pr_details['owner'], pr_details['repo'])
         
         try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
+            pr = pr or self._get_pull(pr_details)
             
             comment = pr.create_issue_comment(comment_text)
             
@@ -200,14 +175,13 @@ class GitHubService:
             else:
                 raise ValueError(f"Failed to post PR comment: {str(e)}")
 
-    def fetch_pr_files_sync(self, pr_details: Dict) -> List[Dict]:
+    def fetch_pr_files_sync(self, pr_details: Dict, pr=None) -> List[Dict]:
         """Synchronous version of fetch_pr_files"""
         if not self.github or not self.token_valid:
             raise ValueError("GitHub token not configured or invalid")
             
         try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
+            pr = pr or self._get_pull(pr_details)
             
             files_data = []
             for f in pr.get_files():
@@ -226,14 +200,13 @@ class GitHubService:
             else:
                 raise ValueError(f"Failed to fetch PR files: {str(e)}")
 
-    def fetch_pr_comments_sync(self, pr_details: Dict) -> List[Dict]:
+    def fetch_pr_comments_sync(self, pr_details: Dict, pr=None) -> List[Dict]:
         """Synchronous version of fetch_pr_comments"""
         if not self.github or not self.token_valid:
             raise ValueError("GitHub token not configured or invalid")
             
         try:
-            repo = self.github.get_repo(f"{pr_details['owner']}/{pr_details['repo']}")
-            pr = repo.get_pull(pr_details['number'])
+            pr = pr or self._get_pull(pr_details)
             
             comments_data = []
             for comment in pr.get_comments():
@@ -247,4 +220,39 @@ class GitHubService:
             if e.status == 403:
                 raise ValueError("Access denied. Please check permissions for viewing comments")
             else:
-                raise ValueError(f"Failed to fetch PR comments: {str(e)}")
\ No newline at end of file
+                raise ValueError(f"Failed to fetch PR comments: {str(e)}")
+
+    def fetch_pr_context(self, pr_details: Dict) -> Dict:
+        """Fetches PR data, files and comments for review
+
+        The pull request is looked up once and its summary read from that
+        object; only the file and comment pagination, which are independent
+        round trips, run in parallel.
+        """
+        if not self.github or not self.token_valid:
+            raise ValueError("GitHub token not configured or invalid")
+
+        try:
+            pr = self._get_pull(pr_details)
+        except GithubException as e:
+            if e.status == 404:
+                raise ValueError("Pull request not found. Please verify the PR URL is correct")
+            elif e.status == 403:
+                raise ValueError("Access denied. Please check repository permissions and ensure token has required access")
+            else:
+                raise ValueError(f"Failed to fetch PR data: {str(e)}")
+
+        pr_data = self.fetch_pr_data(pr_details, pr)
+
+        # Both workers only issue read-only GETs through this pull request's
+        # requester. PyGithub sends them over a requests.Session, whose urllib3
+        # connection pool is safe to share between threads, and each paginated
+        # list keeps its own cursor, so nothing mutable is shared between them.
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            files = executor.submit(self.fetch_pr_files_sync, pr_details, pr)
+            comments = executor.submit(self.fetch_pr_comments_sync, pr_details, pr)
+            return {
+                'pr_data': pr_data,
+                'files': files.result(),
+                'comments': comments.result()
+            }
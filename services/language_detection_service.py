@@ -46,21 +46,23 @@ class LanguageTools:
     
     # Skip directory patterns
     SKIP_PATTERNS = ['__pycache__', '.git', 'node_modules', 'build', 'dist']
+    SKIP_PATTERN_RE = re.compile('|'.join(map(re.escape, SKIP_PATTERNS)))
     
     @staticmethod
+    @lru_cache(maxsize=4096)
     def should_skip_file(filename: str) -> bool:
         """Determine if a file should be skipped based on its extension and path"""
         try:
             path = Path(filename)
             # Check for skip patterns in the full path
-            if any(pattern in str(path) for pattern in LanguageTools.SKIP_PATTERNS):
-                logger.debug(f"Skipping file in excluded directory: {filename}")
+            if LanguageTools.SKIP_PATTERN_RE.search(str(path)):
+                logger.debug("Skipping file in excluded directory: %s", filename)
                 return True
                 
             # Check file extension
             ext = path.suffix.lower()
             if ext in LanguageTools.SKIP_EXTENSIONS:
-                logger.debug(f"Skipping file with excluded extension: {filename}")
+                logger.debug("Skipping file with excluded extension: %s", filename)
                 return True
                 
             return False
@@ -92,6 +94,16 @@ class LanguageTools:
         'yaml': {'name': 'YAML', 'type': 'data'},
         'xml': {'name': 'XML', 'type': 'markup'},
     }
+    
+    # Language-specific content patterns and the confidence boost they give
+    CONFIDENCE_PATTERNS = {
+        'Python': (re.compile(r'import\s+|from\s+\w+\s+import|def\s+\w+\s*\(|class\s+\w+:', re.IGNORECASE), 0.2),
+        'JavaScript': (re.compile(r'const\s+|let\s+|function\s+\w+\s*\(|import\s+.*from|export\s+', re.IGNORECASE), 0.2),
+        'TypeScript': (re.compile(r'interface\s+|type\s+|class\s+\w+\s*{|implements\s+|extends\s+', re.IGNORECASE), 0.2),
+        'Java': (re.compile(r'public\s+class|private\s+|protected\s+|package\s+|import\s+java\.', re.IGNORECASE), 0.2),
+        'HTML': (re.compile(r'<!DOCTYPE\s+html|<html|<head|<body|<div|<span|<p>', re.IGNORECASE), 0.2),
+        'CSS': (re.compile(r'@media|{[\s\w\-:;]+}|\s*[\w\-]+\s*:{1}|@import\s+', re.IGNORECASE), 0.2),
+    }
 
     @staticmethod
     def get_language_from_extension(extension: str) -> Optional[Dict[str, str]]:
@@ -101,25 +113,16 @@ class LanguageTools:
     @staticmethod
     def calculate_confidence(content: str, language_info: Dict[str, str]) -> float:
         """Calculate confidence score based on file content and language"""
-        logger.debug(f"Calculating confidence score for {language_info['name']}")
+        logger.debug("Calculating confidence score for %s", language_info['name'])
         confidence = 0.7  # Base confidence from extension
-        logger.debug(f"Base confidence from extension: {confidence}")
+        logger.debug("Base confidence from extension: %s", confidence)
 
         # Language-specific patterns
-        patterns = {
-            'Python': (r'import\s+|from\s+\w+\s+import|def\s+\w+\s*\(|class\s+\w+:', 0.2),
-            'JavaScript': (r'const\s+|let\s+|function\s+\w+\s*\(|import\s+.*from|export\s+', 0.2),
-            'TypeScript': (r'interface\s+|type\s+|class\s+\w+\s*{|implements\s+|extends\s+', 0.2),
-            'Java': (r'public\s+class|private\s+|protected\s+|package\s+|import\s+java\.', 0.2),
-            'HTML': (r'<!DOCTYPE\s+html|<html|<head|<body|<div|<span|<p>', 0.2),
-            'CSS': (r'@media|{[\s\w\-:;]+}|\s*[\w\-]+\s*:{1}|@import\s+', 0.2),
-        }
-
-        if language_info['name'] in patterns:
-            pattern, boost = patterns[language_info['name']]
-            if re.search(pattern, content, re.IGNORECASE):
+        if language_info['name'] in LanguageTools.CONFIDENCE_PATTERNS:
+            pattern, boost = LanguageTools.CONFIDENCE_PATTERNS[language_info['name']]
+            if pattern.search(content):
                 confidence += boost
-                logger.debug(f"Found {language_info['name']} patterns in content, boosting confidence by {boost}")
+                logger.debug("Found %s patterns in content, boosting confidence by %s", language_info['name'], boost)
 
         return min(confidence, 1.0)
 
@@ -223,7 +226,6 @@ class LanguageDetectionService:
             for file in files:
                 try:
                     filename = file['filename']
-                    logger.info(f"Language Determination: Processing file: {filename}")
                     
                     # Skip non-code files
                     if LanguageTools.should_skip_file(filename):
@@ -236,7 +238,7 @@ class LanguageDetectionService:
                         if 'size' not in file or not file['size']:
                             content = file.get('content', '')
                             file['size'] = len(content.encode('utf-8'))
-                            logger.debug(f"Language Determination: Calculated size for {filename}: {file['size']} bytes")
+                            logger.debug("Language Determination: Calculated size for %s: %d bytes", filename, file['size'])
                     except Exception as e:
                         logger.error(f"Language Determination: Error calculating file size for {filename}: {str(e)}")
                         file['size'] = 0
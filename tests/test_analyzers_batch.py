@@ -0,0 +1,77 @@
+"""Tests for the process-pool batch entry point of the code analyzers."""
+import pytest
+
+from services.code_analysis import AnalysisResult
+from services.code_analysis.analyzers import analyze_files
+from services.code_analysis.analyzers._parallel import MIN_POOL_ITEMS
+
+PYTHON_SOURCE = '''"""Module docs."""
+
+def documented(a, b):
+    """Add two numbers.
+
+    :param a: first
+    :return: the sum
+    """
+    return a + b
+
+def undocumented():
+    return None
+'''
+
+JS_SOURCE = '''import React from 'react';
+const util = require('./util');
+
+/**
+ * Render the widget.
+ * @param {Object} props widget props
+ * @returns {Element}
+ */
+function render(props) {
+    if (props.a && props.b) {
+        for (const x of props.items) { util.use(x); }
+    }
+    return null;
+}
+'''
+
+
+def test_analyze_files_returns_results_in_input_order():
+    items = [
+        (PYTHON_SOURCE, 'pkg/module.py'),
+        ('readme text', 'README.md'),
+        (JS_SOURCE, 'src/widget.js'),
+    ]
+
+    results = analyze_files(items)
+
+    assert len(results) == 3
+    python_result, unsupported, js_result = results
+    assert unsupported is None
+    assert isinstance(python_result, AnalysisResult)
+    assert isinstance(js_result, AnalysisResult)
+
+    python_docs = python_result.documentation_metrics
+    assert python_docs.error is None
+    assert python_docs.module_doc == 'Module docs.'
+    assert set(python_docs.functions) == {'documented', 'undocumented'}
+    assert python_docs.functions['documented']['args'] == ('a', 'b')
+    assert python_docs.coverage == pytest.approx(200 / 3)
+
+    assert sorted(js_result.imports) == ['./util', 'react']
+    assert js_result.total_complexity.cyclomatic_complexity == 3
+    assert js_result.total_complexity.nesting_depth == 3
+    assert js_result.documentation_metrics.functions['render']['args'] == ('props',)
+
+
+def test_analyze_files_matches_in_process_analysis():
+    items = [(PYTHON_SOURCE, f'pkg/module_{n}.py') for n in range(MIN_POOL_ITEMS - 1)]
+    items.append((JS_SOURCE, 'src/widget.js'))
+
+    pooled = analyze_files(items)
+
+    assert pooled == analyze_files(items[:1]) * (MIN_POOL_ITEMS - 1) + analyze_files(items[-1:])
+
+
+def test_analyze_files_handles_empty_input():
+    assert analyze_files([]) == []
@@ -0,0 +1,28 @@
+"""Tests for FileAnalyzer feature detection."""
+import pytest
+
+pytest.importorskip('lizard')
+
+from services.code_structure_service import FileAnalyzer
+
+
+def detect(content):
+    return FileAnalyzer(content, 'Python')._detect_features(content)
+
+
+def test_feature_scan_reports_overlapping_features():
+    # The '../' inside open(...) is both a file handle and a path traversal
+    content = "open('../data') and execute('select %s')"
+
+    assert detect(content) == {'file_handles', 'path_traversal', 'sql_injection'}
+
+
+def test_feature_scan_is_case_insensitive():
+    assert detect('await Login(); Cache.close()') == {
+        'async_operations', 'authentication', 'caching', 'close'
+    }
+
+
+def test_feature_scan_requires_the_full_pattern():
+    # A %d placeholder, a bare open() and exec without a call match nothing
+    assert detect("execute('select %d') or open() or exec") == set()
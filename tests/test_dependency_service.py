@@ -0,0 +1,65 @@
+"""Tests for DependencyService module metrics."""
+import pytest
+
+from services.dependency_service import DependencyService
+
+
+@pytest.fixture
+def service():
+    return DependencyService()
+
+
+def test_code_duplication_reports_every_later_copy(service):
+    block = [f'line {n}' for n in range(6)]
+    lines = block + ['gap'] + block + block + ['end']
+
+    result = service._find_code_duplication(lines)
+
+    pairs = [(b['start_line1'], b['start_line2']) for b in result['duplicate_blocks']]
+    assert pairs == [(1, 8), (1, 14), (8, 14)]
+
+
+def test_code_duplication_skips_overlapping_copies(service):
+    result = service._find_code_duplication(['same'] * 13)
+
+    # Only the pair of windows that do not overlap is reported
+    assert [(b['start_line1'], b['start_line2']) for b in result['duplicate_blocks']] == [(1, 7)]
+    assert result['similarity_score'] == 6 / 13
+
+
+def test_code_duplication_never_compares_the_final_block(service):
+    block = [f'line {n}' for n in range(6)]
+
+    # As with the pairwise scan it replaced, a copy ending on the last line is not seen
+    assert service._find_code_duplication(block + ['gap'] + block)['duplicate_blocks'] == []
+
+
+def test_comment_ratio_counts_docstring_lines_as_comments(service):
+    lines = ['# heading', '"""Doc."""', "'''more'''", '', '   ', 'x = 1', 'def f():', '    return x']
+
+    assert service._calculate_comment_ratio(lines) == 1.0
+
+
+def test_comment_ratio_without_code_lines(service):
+    assert service._calculate_comment_ratio([]) == 0.0
+    assert service._calculate_comment_ratio(['# only a comment', '']) == 1.0
+
+
+def test_exports_list_all_entries_before_public_definitions(service):
+    lines = [
+        "__all__ = ['alpha', \"beta\" , 'gamma',]",
+        '__all__ += extra',
+        'def alpha():',
+        'class Widget(Base):',
+        '    def beta(self, x):',
+    ]
+
+    exports = service._analyze_exports('\n'.join(lines), lines)
+
+    assert exports == ['alpha', 'beta', 'gamma', 'Widget']
+
+
+def test_exports_of_module_without_definitions(service):
+    lines = ['x = 1', '# def not_code():']
+
+    assert service._analyze_exports('\n'.join(lines), lines) == []
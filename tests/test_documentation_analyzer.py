@@ -0,0 +1,197 @@
+"""Tests for DocumentationAnalyzer."""
+import ast
+import dataclasses
+
+import pytest
+
+from services.code_analysis import DocumentationMetrics
+from services.code_analysis.analyzers import PythonAnalyzer, _parallel, documentation_analyzer
+from services.code_analysis.analyzers.documentation_analyzer import (
+    DocumentationAnalyzer,
+    walk_statements,
+)
+
+PYTHON_SOURCE = '''"""Module docs."""
+
+class Widget:
+    """A widget."""
+
+    def draw(self, canvas) -> None:
+        """Draw onto canvas."""
+
+def build(name: str) -> "Widget":
+    return Widget()
+'''
+
+JS_SOURCE = '''/**
+ * Greet someone.
+ * @param {string} name who to greet
+ * @returns {string}
+ */
+function greet(name) { return 'hi ' + name; }
+'''
+
+FILES = [
+    (PYTHON_SOURCE, 'widget.py'),
+    (JS_SOURCE, 'greet.js'),
+    ('plain text', 'notes.txt'),
+]
+
+
+@pytest.fixture
+def analyzer():
+    return DocumentationAnalyzer()
+
+
+def test_analyze_many_matches_single_file_analysis(analyzer):
+    expected = [DocumentationAnalyzer().analyze_documentation(*item) for item in FILES]
+
+    assert analyzer.analyze_many(FILES) == expected
+
+
+def test_analyze_many_serves_repeated_files_from_cache(analyzer, monkeypatch):
+    supported = FILES[:2]
+    first = analyzer.analyze_many(supported)
+
+    def no_analysis(item):
+        raise AssertionError("cached files must not be analyzed again")
+    monkeypatch.setattr(documentation_analyzer, '_analyze_one', no_analysis)
+    monkeypatch.setattr(analyzer, 'analyze_documentation', no_analysis)
+
+    assert analyzer.analyze_many(supported) == first
+
+
+def test_analyze_many_keeps_small_batches_in_process(analyzer, monkeypatch):
+    def no_pool(*args, **kwargs):
+        raise AssertionError("small batches must not start a worker pool")
+    monkeypatch.setattr(_parallel, 'ProcessPoolExecutor', no_pool)
+
+    assert len(analyzer.analyze_many(FILES)) == len(FILES)
+
+
+def test_analyze_many_uses_worker_pool_for_large_batches(analyzer):
+    files = [(f'"""Module {n}."""\n', f'module_{n}.py') for n in range(_parallel.MIN_POOL_ITEMS)]
+    expected = [DocumentationAnalyzer().analyze_documentation(*item) for item in files]
+
+    assert analyzer.analyze_many(files) == expected
+
+
+def test_python_documentation_metrics(analyzer):
+    metrics = analyzer.analyze_documentation(PYTHON_SOURCE, 'widget.py')
+
+    assert metrics.error is None
+    assert metrics.module_doc == 'Module docs.'
+    assert metrics.classes['Widget']['methods']['draw'] == {
+        'docstring': 'Draw onto canvas.',
+        'args': ('self', 'canvas'),
+        'returns': 'None',
+    }
+    assert metrics.functions['build']['returns'] == "'Widget'"
+    assert metrics.coverage == 80.0
+
+
+def test_jsdoc_documentation_metrics(analyzer):
+    metrics = analyzer.analyze_documentation(JS_SOURCE, 'greet.js')
+
+    assert metrics.functions['greet']['args'] == ('name',)
+    assert metrics.functions['greet']['returns'] == 'string'
+
+
+def test_quality_score_weighs_length_and_tags(analyzer):
+    metrics = DocumentationMetrics(
+        module_doc='Module docs.',
+        functions={
+            'add': {'docstring': 'Add two numbers.\n\n:param a: first\n:return: the sum'},
+            'bare': {'docstring': None},
+        },
+    )
+
+    # 2 words score 20; 9 words plus both tags cap at 100
+    assert analyzer._calculate_quality_score(metrics) == 60.0
+
+
+def test_vendored_files_are_skipped(analyzer):
+    metrics = analyzer.analyze_documentation(JS_SOURCE, 'node_modules/lib/greet.js')
+
+    assert metrics.error == 'Skipped: node_modules/lib/greet.js'
+
+
+def test_cached_metrics_are_shared_and_read_only(analyzer):
+    first = analyzer.analyze_documentation(PYTHON_SOURCE, 'widget.py')
+
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        first.coverage = 0.0
+    with pytest.raises(TypeError):
+        first.functions.clear()
+    with pytest.raises(TypeError):
+        first.classes['Widget']['methods']['draw']['docstring'] = None
+
+    assert analyzer.analyze_documentation(PYTHON_SOURCE, 'widget.py') is first
+
+
+def test_failed_analysis_is_not_cached(analyzer):
+    metrics = analyzer.analyze_documentation('def broken(:\n', 'broken.py')
+
+    assert metrics.error is not None
+    assert not analyzer._metrics_cache
+
+
+def test_python_analyzer_applies_skip_guards():
+    result = PythonAnalyzer().analyze_code(PYTHON_SOURCE, '.venv/lib/widget.py')
+
+    assert result.documentation_metrics.error == 'Skipped: .venv/lib/widget.py'
+
+
+def test_parse_cache_is_keyed_on_digest_and_bounded():
+    tree = documentation_analyzer.parse_python_source(PYTHON_SOURCE)
+
+    assert documentation_analyzer.parse_python_source(PYTHON_SOURCE) is tree
+    assert PYTHON_SOURCE not in documentation_analyzer._parse_cache
+
+    for i in range(documentation_analyzer._PARSE_CACHE_SIZE + 1):
+        documentation_analyzer.parse_python_source(f'x = {i}')
+    assert len(documentation_analyzer._parse_cache) == documentation_analyzer._PARSE_CACHE_SIZE
+
+
+BLOCKS_SOURCE = '''
+import os
+
+class Outer:
+    def method(self):
+        try:
+            from x import y
+        except ValueError:
+            def handler():
+                pass
+        else:
+            class Inner:
+                pass
+        finally:
+            lambda: (yield)
+
+for item in items:
+    def in_loop(): pass
+else:
+    import sys
+
+match command:
+    case [name]:
+        def matched(): pass
+    case _:
+        class Fallback: pass
+
+with open(path) as handle:
+    async def reader(): pass
+'''
+
+
+def test_walk_statements_reaches_every_block_in_ast_walk_order():
+    tree = ast.parse(BLOCKS_SOURCE)
+    definitions = (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef, ast.Import, ast.ImportFrom)
+
+    names = [getattr(node, 'name', None) or node.names[0].name
+             for node in walk_statements(tree) if isinstance(node, definitions)]
+
+    # Breadth first, as ast.walk visits them: try/except/else, for/else, match and with bodies
+    assert names == ['os', 'Outer', 'method', 'in_loop', 'sys', 'reader',
+                     'matched', 'Fallback', 'y', 'Inner', 'handler']
@@ -0,0 +1,92 @@
+"""Tests for GitHubService."""
+import pytest
+
+pytest.importorskip('github')
+
+from services.github_service import GitHubService
+
+PR_DETAILS = {'owner': 'octo', 'repo': 'widgets', 'number': 7}
+
+
+class FakeFile:
+    filename = 'widget.py'
+    status = 'modified'
+    additions = 2
+    deletions = 1
+    changes = 3
+    patch = None
+
+
+class FakeComment:
+    class user:
+        login = 'reviewer'
+    body = 'Looks good'
+    created_at = '2024-01-01T00:00:00Z'
+
+
+class FakePull:
+    title = 'Add widgets'
+    body = 'Adds widgets'
+    state = 'open'
+    commits = 1
+    changed_files = 1
+    additions = 2
+    deletions = 1
+
+    def get_files(self):
+        return [FakeFile()]
+
+    def get_comments(self):
+        return [FakeComment()]
+
+
+class FakeGithub:
+    def __init__(self):
+        self.pull_lookups = 0
+
+    def get_repo(self, full_name, lazy=False):
+        assert full_name == 'octo/widgets'
+        return self
+
+    def get_pull(self, number):
+        assert number == 7
+        self.pull_lookups += 1
+        return FakePull()
+
+
+@pytest.fixture
+def service():
+    service = GitHubService(None)
+    service.github = FakeGithub()
+    service.token_valid = True
+    return service
+
+
+def test_fetch_pr_context_resolves_pull_once(service):
+    context = service.fetch_pr_context(PR_DETAILS)
+
+    assert service.github.pull_lookups == 1
+    assert context['pr_data']['title'] == 'Add widgets'
+    assert context['files'] == [{
+        'filename': 'widget.py',
+        'status': 'modified',
+        'additions': 2,
+        'deletions': 1,
+        'changes': 3,
+        'patch': ''
+    }]
+    assert context['comments'] == [{
+        'user': 'reviewer',
+        'body': 'Looks good',
+        'created_at': '2024-01-01T00:00:00Z'
+    }]
+
+
+def test_fetch_methods_reuse_passed_pull(service):
+    pr = FakePull()
+
+    service.fetch_pr_data(PR_DETAILS, pr)
+    service.fetch_pr_files_sync(PR_DETAILS, pr)
+    service.fetch_pr_comments_sync(PR_DETAILS, pr)
+
+    assert service.github.pull_lookups == 0
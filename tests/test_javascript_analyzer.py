@@ -0,0 +1,31 @@
+"""Tests for JavaScriptAnalyzer."""
+from services.code_analysis.analyzers import JavaScriptAnalyzer
+
+
+def test_nesting_depth_of_nested_blocks():
+    analyzer = JavaScriptAnalyzer()
+    content = 'function f(a) { if (a) { for (;;) { g(); } } else { h({}); } }'
+
+    assert analyzer._calculate_nesting_depth(content) == 3
+
+
+def test_nesting_depth_ignores_unmatched_closing_braces():
+    analyzer = JavaScriptAnalyzer()
+
+    assert analyzer._calculate_nesting_depth('') == 0
+    assert analyzer._calculate_nesting_depth('}}}') == 0
+    assert analyzer._calculate_nesting_depth('}}{ {} }') == 2
+    assert analyzer._calculate_nesting_depth('{ { } } } { }') == 2
+    # Depth reached after a stray brace counts from zero, not from below it
+    assert analyzer._calculate_nesting_depth('{}}}{{{}}}') == 3
+
+
+def test_scan_counts_everything_on_a_minified_line():
+    analyzer = JavaScriptAnalyzer()
+    content = ("import React from 'react';const u=require('./util'),ok=a&&b;"
+               "import {x} from './x';import('./lazy');")
+
+    result = analyzer.analyze_code(content, 'bundle.js')
+
+    assert result.imports == ['react', './util', './x', './lazy']
+    assert result.total_complexity.cyclomatic_complexity == 2
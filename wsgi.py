@@ -232,15 +232,21 @@ def review():
             return redirect(url_for('index', error="Missing API credentials"))
 
         from services.github_service import GitHubService
-        from services.claude_service import ClaudeService
+        from services.claude_service import (
+            ClaudeService,
+            build_structure_metrics,
+            shared_code_structure_service,
+            shared_doc_parser
+        )
         
         github_service = GitHubService(github_token)
         claude_service = ClaudeService(claude_api_key)
 
         # Fetch PR data
-        pr_data = github_service.fetch_pr_data(pr_details)
-        files = github_service.fetch_pr_files_sync(pr_details)
-        comments = github_service.fetch_pr_comments_sync(pr_details)
+        pr_context = github_service.fetch_pr_context(pr_details)
+        pr_data = pr_context['pr_data']
+        files = pr_context['files']
+        comments = pr_context['comments']
         
         # Convert files and comments content for analysis
         for file in files:
@@ -250,29 +256,22 @@ def review():
                 logger.error(f"Error processing file content: {str(e)}")
                 file['content'] = ''
 
-        # Initialize services
-        from services.code_structure_service import CodeStructureService
-        from plugins.documentation_parser import DocumentationParser
-        
-        code_structure_service = CodeStructureService()
-        doc_parser = DocumentationParser()
-        doc_parser.initialize()
+        # Reuse the process-wide analyzers instead of rebuilding them per request
+        code_structure_service = shared_code_structure_service()
+        doc_parser = shared_doc_parser()
 
         # Analyze code structure and documentation
-        structure_analysis = {}
+        totals = []
         for file in files:
             try:
                 analysis = code_structure_service.analyze_code(
                     file.get('content', ''),
                     file['filename']
                 )
-                structure_analysis[file['filename']] = {
-                    'structures': analysis.structures,
-                    'imports': analysis.imports,
-                    'total_complexity': analysis.total_complexity
-                }
+                totals.append((file['filename'], analysis.total_complexity))
             except Exception as e:
                 logger.error(f"Error analyzing {file['filename']}: {str(e)}")
+        structure_analysis = build_structure_metrics(totals)
 
         # Parse documentation
         doc_analysis = doc_parser.execute_sync({